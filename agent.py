@@ -1,24 +1,27 @@
 """
 LangGraph agent for AI-powered producer onboarding
 """
-from typing import Any, Dict, List, Annotated, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, END, START
-from langgraph.graph.message import add_messages
-from groq import Groq
-import json
+import asyncio
+import msgspec
+import re
 import uuid
 from datetime import datetime, timedelta
 
-from config import GROQ_API_KEY, CALENDLY_API_TOKEN, CALENDLY_EVENT_TYPE_UUID
+from config import CALENDLY_API_TOKEN, CALENDLY_EVENT_TYPE_UUID
 from producer_onboarding_models import (
     OnboardingStatus, ValidationIssue, 
     AnswerAssessmentResponse, DataValidationResponse
 )
-from validation_tools import ComplianceValidator, CalendlyScheduler
-
-# Initialize Groq client
-groq_client = Groq(api_key=GROQ_API_KEY)
+from compliance import (
+    CalendlyScheduler, validate_email, validate_fssai, validate_gst,
+    validate_pan, validate_phone, validate_pincode
+)
+from llm import chat_completion, chat_completion_json, prompt_json
 
 # Initialize Calendly scheduler
 calendly = CalendlyScheduler(
@@ -29,7 +32,7 @@ calendly = CalendlyScheduler(
 # Agent State
 class OnboardingState(TypedDict):
     """State for the onboarding conversation"""
-    messages: Annotated[list, add_messages]
+    messages: List[Dict[str, str]]  # {"role", "content"} dicts; append-only, appended in place, so no merge reducer
     session_id: str
     producer_id: str
     collected_data: Dict[str, Any]
@@ -41,92 +44,274 @@ class OnboardingState(TypedDict):
     conversation_context: Dict[str, Any]
     attempts: int
     field_validation_results: Dict[str, Any]  # Store validation results for each field
+    validation_failure_count: int  # Running totals kept in step with field_validation_results
+    manual_review_count: int
+    last_user_msg_idx: Optional[int]  # Index of the latest user message in messages
+    last_ai_message: Optional[str]  # Content of the latest assistant message in messages
+
+# Deterministic validators, keyed by the field names the agent may ask for
+_VALIDATION_MAP: Mapping[str, Callable[[str], Dict[str, Any]]] = MappingProxyType({
+    'gst_number': validate_gst,
+    'gst': validate_gst,
+    'pan_number': validate_pan,
+    'pan': validate_pan,
+    'fssai_number': validate_fssai,
+    'fssai': validate_fssai,
+    'fssai_license': validate_fssai,
+    'phone': validate_phone,
+    'phone_number': validate_phone,
+    'mobile': validate_phone,
+    'email': validate_email,
+    'email_address': validate_email,
+    'pincode': validate_pincode,
+    'pin_code': validate_pincode,
+    'postal_code': validate_pincode
+})
+
+# Small model for structured extraction and short replies, large model for
+# open-ended compliance and risk reasoning
+_MODEL_BY_TASK = {
+    "extract": "llama-3.1-8b-instant",
+    "reason": "llama-3.3-70b-versatile"
+}
+
+# Expected shapes of the JSON the LLM nodes return; responses are validated
+# against these at decode time so malformed output fails at the boundary
+class FieldAnalysisStruct(msgspec.Struct):
+    required_fields: List[Dict[str, Any]] = []
+    required_documents: List[Dict[str, Any]] = []
+    next_priority_field: Optional[str] = None
+    domain_specific_requirements: List[str] = []
+
+class AssessmentStruct(msgspec.Struct):
+    valid: bool
+    confidence: float
+    extracted_value: Any = None
+    feedback: str = ""
+    requires_clarification: bool = False
+    clarification_prompt: Optional[str] = None
+
+class DataValidationStruct(msgspec.Struct):
+    completeness_percentage: float
+    is_complete: bool
+    risk_score: float
+    issues: List[Dict[str, Any]] = []
+    risk_factors: List[str] = []
+    recommendations: List[str] = []
+    requires_manual_verification: bool = False
+
+# Static instructions for each LLM node. They are sent first as the system
+# message so the shared prefix stays identical across calls and can be served
+# from the provider's prompt cache; per-session data goes in the user message.
+_ANALYSIS_PREAMBLE = """
+As an expert in Indian business compliance and producer onboarding, analyze the collected data
+provided by the user and determine what additional information is required.
+
+Based on the business type, domain, and Indian regulatory requirements, determine:
+1. What critical fields are still missing
+2. What documents are required
+3. The priority order for collecting missing information
+4. Any domain-specific requirements
+
+Consider regulations like:
+- GST requirements
+- FSSAI for food businesses
+- Drug license for pharmaceuticals
+- BIS standards for manufacturing
+- State-specific requirements
+
+Respond in JSON format:
+{
+    "required_fields": [
+        {"field": "field_name", "priority": 1-10, "reason": "why needed", "category": "basic/compliance/verification"}
+    ],
+    "required_documents": [
+        {"document": "doc_type", "mandatory": true/false, "reason": "why needed"}
+    ],
+    "next_priority_field": "field_name",
+    "domain_specific_requirements": ["list of specific requirements"]
+}
+"""
+
+_PROMPT_GEN_PREAMBLE = """
+You are a friendly, professional onboarding assistant helping a producer/business owner register on our platform.
+
+Generate a natural, conversational prompt to collect the field named in the context provided by the user.
+
+Guidelines:
+- Be warm and professional
+- Explain why this information is needed (compliance, verification, etc.)
+- If relevant, reference previously collected information
+- For documents, explain acceptable formats
+- Make it feel like a conversation, not a form
+- Include any helpful hints or examples
+- If this is a retry (attempts > 0), acknowledge the issue and provide clearer guidance
+
+Respond with just the conversational prompt, nothing else.
+"""
+
+_ASSESSMENT_PREAMBLE = """
+Assess if the user's response is valid and complete for the requested field.
+
+Perform these checks:
+1. Is the response relevant to the field requested?
+2. Is the format correct? (e.g., email format, phone number format, GST format)
+3. Is the information complete and usable?
+4. Are there any red flags or suspicious patterns?
+5. Can you extract the actual value from the response?
+
+For Indian compliance, check:
+- GST: 15 characters (2 digit state code + 10 char PAN + 1 digit + 1 check alphabet + 1 digit)
+- PAN: 10 characters (5 letters + 4 digits + 1 letter)
+- Phone: Valid Indian mobile (10 digits) or landline
+- Pincode: 6 digits
+
+Respond in JSON format:
+{
+    "valid": true/false,
+    "confidence": 0.0-1.0,
+    "extracted_value": "the actual value to store",
+    "feedback": "Clear explanation of what's wrong or 'Looks good!'",
+    "requires_clarification": true/false,
+    "clarification_prompt": "optional prompt for clarification"
+}
+"""
+
+_VALIDATION_PREAMBLE = """
+As a compliance expert, validate the producer data provided by the user for completeness and authenticity.
+
+Consider:
+1. The number of validation failures
+2. The fields needing manual review
+3. Check completeness - are all critical fields present?
+4. Check consistency - does the data make sense together?
+5. Identify any red flags or suspicious patterns
+6. Calculate a risk score (0-100) based on:
+   - Completeness (30%)
+   - Data validity (30%) - weight validation failures heavily
+   - Business credibility (20%)
+   - Compliance with regulations (20%)
+
+Add 10 points to risk score for each validation failure.
+Add 5 points for each field needing manual review.
+
+Consider Indian business regulations and typical patterns.
+
+Respond in JSON format:
+{
+    "completeness_percentage": 0-100,
+    "is_complete": true/false,
+    "issues": [
+        {"field": "field_name", "issue": "description", "severity": 0.0-1.0}
+    ],
+    "risk_score": 0-100,
+    "risk_factors": ["list of risk factors"],
+    "recommendations": ["list of recommendations"],
+    "requires_manual_verification": true/false
+}
+"""
+
+# Labelled values in free-form answers, e.g. "GST: 27AAPFU0939F1ZV, email is a@b.com"
+_LABELLED_FIELD_PATTERN = re.compile(
+    r'\b(gst|pan|fssai|phone|mobile|e-?mail|pin[\s_]?code|postal[\s_]code)'
+    r'(?:[\s_](?:number|no\.?|address|license|licence))?'
+    r'\s*(?::|=|\s-\s|\bis\b)\s*([^,;\n]+?)(?=\s*(?:[,;\n]|\band\b|$))',
+    re.IGNORECASE
+)
+_LABEL_TO_FIELD = {
+    'gst': 'gst_number',
+    'pan': 'pan_number',
+    'fssai': 'fssai_number',
+    'phone': 'phone',
+    'mobile': 'phone',
+    'email': 'email',
+    'e-mail': 'email',
+    'pin': 'pincode',
+    'pincode': 'pincode',
+    'postal': 'pincode'
+}
 
 # Tool Functions
-def validate_field_with_tool(field_name: str, value: str) -> Dict[str, Any]:
-    """Use validation tools to validate specific fields"""
-    
-    validator = ComplianceValidator()
-    
-    # Map field names to validation functions
-    validation_map = {
-        'gst_number': validator.validate_gst,
-        'gst': validator.validate_gst,
-        'pan_number': validator.validate_pan,
-        'pan': validator.validate_pan,
-        'fssai_number': validator.validate_fssai,
-        'fssai': validator.validate_fssai,
-        'fssai_license': validator.validate_fssai,
-        'phone': validator.validate_phone,
-        'phone_number': validator.validate_phone,
-        'mobile': validator.validate_phone,
-        'email': validator.validate_email,
-        'email_address': validator.validate_email,
-        'pincode': validator.validate_pincode,
-        'pin_code': validator.validate_pincode,
-        'postal_code': validator.validate_pincode
-    }
-    
-    # Get the appropriate validation function
-    validate_func = validation_map.get(field_name.lower())
-    
-    if validate_func:
-        return validate_func(value)
-    
-    # Default validation for other fields
+def _default_valid(value: str) -> Dict[str, Any]:
+    """Default validation for fields without a dedicated validator"""
     return {
         "valid": True,
         "error": None,
         "details": {"value": value}
     }
 
-def analyze_required_fields(state: OnboardingState) -> OnboardingState:
+def validate_field_with_tool(field_name: str, value: str) -> Dict[str, Any]:
+    """Use validation tools to validate specific fields"""
+    return _VALIDATION_MAP.get(field_name.lower(), _default_valid)(value)
+
+def _record_field_validation(state: OnboardingState, field_name: str, result: Dict[str, Any]) -> None:
+    """Store a field's validation result and update the running failure/review counters"""
+    results = state.setdefault("field_validation_results", {})
+    failures = state.get("validation_failure_count", 0)
+    reviews = state.get("manual_review_count", 0)
+    
+    previous = results.get(field_name)
+    if previous is not None:
+        failures -= not previous.get("valid", True)
+        reviews -= bool(previous.get("needs_manual_review", False))
+    
+    results[field_name] = result
+    state["validation_failure_count"] = failures + (not result.get("valid", True))
+    state["manual_review_count"] = reviews + bool(result.get("needs_manual_review", False))
+
+def _append_assistant_message(state: OnboardingState, content: str) -> None:
+    """Append an assistant turn and keep last_ai_message pointing at it"""
+    state["messages"].append({"role": "assistant", "content": content})
+    state["last_ai_message"] = content
+
+def _user_message_content(msg: Dict[str, str]) -> Optional[str]:
+    """Return the content of a user message, or None for any other message"""
+    return msg.get("content", "") if msg.get("role") == "user" else None
+
+def _tool_extracted_value(tool_result: Dict[str, Any], fallback: str) -> str:
+    """Pick the normalized value out of a validator's details"""
+    for key, value in tool_result.get("details", {}).items():
+        if key == "value" or key.startswith("formatted_"):
+            return value
+    return fallback
+
+def validate_field_locally(field_name: Optional[str], answer: str) -> Optional[Dict[str, Any]]:
+    """Run the deterministic validator for the field, or None if it has none"""
+    validate_func = _VALIDATION_MAP.get(field_name.lower()) if field_name else None
+    return validate_func(answer.strip()) if validate_func else None
+
+def accepted_assessment(tool_result: Dict[str, Any], answer: str) -> Dict[str, Any]:
+    """Assessment for an answer its deterministic validator accepted"""
+    return {
+        "valid": True,
+        "confidence": 1.0,
+        "extracted_value": _tool_extracted_value(tool_result, answer.strip()),
+        "feedback": "Looks good!",
+        "requires_clarification": False,
+        "clarification_prompt": None
+    }
+
+async def analyze_required_fields(state: OnboardingState) -> OnboardingState:
     """Analyze what fields are required based on business type and context"""
     
     collected = state["collected_data"]
     
     # Use AI to determine required fields dynamically
-    analysis_prompt = f"""
-    As an expert in Indian business compliance and producer onboarding, analyze the following collected data 
-    and determine what additional information is required:
-
-    Collected Data: {json.dumps(collected, indent=2)}
-
-    Based on the business type, domain, and Indian regulatory requirements, determine:
-    1. What critical fields are still missing
-    2. What documents are required
-    3. The priority order for collecting missing information
-    4. Any domain-specific requirements
-
-    Consider regulations like:
-    - GST requirements
-    - FSSAI for food businesses
-    - Drug license for pharmaceuticals
-    - BIS standards for manufacturing
-    - State-specific requirements
-
-    Respond in JSON format:
-    {{
-        "required_fields": [
-            {{"field": "field_name", "priority": 1-10, "reason": "why needed", "category": "basic/compliance/verification"}}
-        ],
-        "required_documents": [
-            {{"document": "doc_type", "mandatory": true/false, "reason": "why needed"}}
-        ],
-        "next_priority_field": "field_name",
-        "domain_specific_requirements": ["list of specific requirements"]
-    }}
-    """
+    analysis_prompt = f"Collected Data: {prompt_json(collected)}"
     
     try:
-        completion = groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": analysis_prompt}],
+        analysis = await chat_completion_json(
+            model=_MODEL_BY_TASK["reason"],
+            messages=[
+                {"role": "system", "content": _ANALYSIS_PREAMBLE},
+                {"role": "user", "content": analysis_prompt}
+            ],
             temperature=0.3,
-            max_tokens=1000
+            max_tokens=400,
+            cache=True,
+            schema=FieldAnalysisStruct
         )
         
-        analysis = json.loads(completion.choices[0].message.content.strip())
         state["conversation_context"]["field_analysis"] = analysis
         state["current_field"] = analysis.get("next_priority_field")
         
@@ -141,7 +326,7 @@ def analyze_required_fields(state: OnboardingState) -> OnboardingState:
     
     return state
 
-def generate_contextual_prompt(state: OnboardingState) -> OnboardingState:
+async def generate_contextual_prompt(state: OnboardingState) -> OnboardingState:
     """Generate a contextual, conversational prompt for the current field"""
     
     current_field = state["current_field"]
@@ -154,126 +339,156 @@ def generate_contextual_prompt(state: OnboardingState) -> OnboardingState:
     
     # Generate conversational prompt using AI
     prompt_generation = f"""
-    You are a friendly, professional onboarding assistant helping a producer/business owner register on our platform.
-    
     Context:
     - Current field needed: {current_field}
-    - Already collected: {json.dumps(collected, indent=2)}
+    - Already collected: {prompt_json(collected)}
     - Previous conversation: {state.get('messages', [])[-3:] if state.get('messages') else 'Just starting'}
     
-    Generate a natural, conversational prompt to collect the '{current_field}' information.
-    
-    Guidelines:
-    - Be warm and professional
-    - Explain why this information is needed (compliance, verification, etc.)
-    - If relevant, reference previously collected information
-    - For documents, explain acceptable formats
-    - Make it feel like a conversation, not a form
-    - Include any helpful hints or examples
-    - If this is a retry (attempts > 0), acknowledge the issue and provide clearer guidance
-    
     Attempts so far: {state.get('attempts', 0)}
-    
-    Respond with just the conversational prompt, nothing else.
     """
     
     try:
-        completion = groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt_generation}],
+        prompt = await chat_completion(
+            model=_MODEL_BY_TASK["extract"],
+            messages=[
+                {"role": "system", "content": _PROMPT_GEN_PREAMBLE},
+                {"role": "user", "content": prompt_generation}
+            ],
             temperature=0.7,
             max_tokens=300
         )
         
-        prompt = completion.choices[0].message.content.strip()
-        state["messages"].append({"role": "assistant", "content": prompt})
+        _append_assistant_message(state, prompt)
         state["next_action"] = "wait_response"
         
     except Exception as e:
         print(f"Error generating prompt: {e}")
         # Fallback prompt
         prompt = f"Could you please provide your {current_field}?"
-        state["messages"].append({"role": "assistant", "content": prompt})
+        _append_assistant_message(state, prompt)
         state["next_action"] = "wait_response"
     
     return state
 
-def assess_user_response(state: OnboardingState) -> OnboardingState:
+def _extract_labelled_fields(user_response: str) -> Dict[str, str]:
+    """Pull explicitly labelled values (e.g. "GST: ...", "email is ...") out of a message"""
+    fields = {}
+    for match in _LABELLED_FIELD_PATTERN.finditer(user_response):
+        label = re.sub(r'[\s_]+', ' ', match.group(1).lower())
+        field = _LABEL_TO_FIELD.get(label.split()[0])
+        value = match.group(2).strip().rstrip('.')
+        if field and value and field not in fields:
+            fields[field] = value
+    return fields
+
+def _is_confident(assessment: Dict[str, Any]) -> bool:
+    """Check if an assessment is good enough to store the extracted value"""
+    return bool(assessment["valid"]) and assessment["confidence"] > 0.7
+
+async def _assess_single(field_name: Optional[str], user_response: str, collected: Dict[str, Any]) -> tuple:
+    """
+    Assess one field's answer, returning (assessment, tool_result).
+    Fields with a deterministic validator are checked locally first; a
+    well-formed answer is accepted without an LLM round-trip.
+    """
+    tool_result = validate_field_locally(field_name, user_response)
+    
+    if tool_result is not None and tool_result["valid"]:
+        return accepted_assessment(tool_result, user_response), tool_result
+    
+    # Use AI to assess the response; the response cache is keyed on the whole
+    # request, so an assessment is only reused for the same answer in the same context
+    assessment_prompt = f"""
+    Field requested: {field_name}
+    User response: {user_response}
+    Context: {prompt_json(collected)}
+    """
+    assessment = await chat_completion_json(
+        model=_MODEL_BY_TASK["extract"],
+        messages=[
+            {"role": "system", "content": _ASSESSMENT_PREAMBLE},
+            {"role": "user", "content": assessment_prompt}
+        ],
+        temperature=0.2,
+        max_tokens=150,
+        cache=True,
+        schema=AssessmentStruct
+    )
+    
+    if tool_result is not None and _is_confident(assessment):
+        # The raw answer failed but the LLM pulled a value out of it, which is
+        # only stored if it passes the validator too
+        tool_result = validate_field_locally(field_name, str(assessment["extracted_value"]))
+        if not tool_result["valid"]:
+            assessment = {**assessment, "valid": False, "feedback": tool_result["error"]}
+    
+    return assessment, tool_result
+
+async def assess_user_response(state: OnboardingState) -> OnboardingState:
     """Assess the user's response using AI"""
     
     if not state["messages"] or len(state["messages"]) < 2:
         state["next_action"] = "prompt"
         return state
     
-    # Get the last user message
+    # Get the last user message, using the recorded index when available
     user_response = None
-    for msg in reversed(state["messages"]):
-        # Handle both dict and LangChain message object formats
-        if hasattr(msg, 'type') and msg.type == "human":
-            # LangChain HumanMessage object
-            user_response = msg.content
-            break
-        elif isinstance(msg, dict) and msg.get("role") == "user":
-            # Dictionary format
-            user_response = msg.get("content", "")
-            break
+    last_idx = state.get("last_user_msg_idx")
+    if last_idx is not None and last_idx < len(state["messages"]):
+        user_response = _user_message_content(state["messages"][last_idx])
+    if user_response is None:
+        user_response = next(
+            (content for content in map(_user_message_content, reversed(state["messages"]))
+             if content is not None),
+            None
+        )
     
     if not user_response:
         state["next_action"] = "prompt"
         return state
     
     current_field = state["current_field"]
+    collected = state["collected_data"]
     
-    # Use AI to assess the response
-    assessment_prompt = f"""
-    Assess if the user's response is valid and complete for the requested field.
-    
-    Field requested: {current_field}
-    User response: {user_response}
-    Context: {json.dumps(state["collected_data"], indent=2)}
-    
-    Perform these checks:
-    1. Is the response relevant to the field requested?
-    2. Is the format correct? (e.g., email format, phone number format, GST format)
-    3. Is the information complete and usable?
-    4. Are there any red flags or suspicious patterns?
-    5. Can you extract the actual value from the response?
-    
-    For Indian compliance, check:
-    - GST: 15 characters (2 digit state code + 10 char PAN + 1 digit + 1 check alphabet + 1 digit)
-    - PAN: 10 characters (5 letters + 4 digits + 1 letter)
-    - Phone: Valid Indian mobile (10 digits) or landline
-    - Pincode: 6 digits
-    
-    Respond in JSON format:
-    {{
-        "valid": true/false,
-        "confidence": 0.0-1.0,
-        "extracted_value": "the actual value to store",
-        "feedback": "Clear explanation of what's wrong or 'Looks good!'",
-        "requires_clarification": true/false,
-        "clarification_prompt": "optional prompt for clarification"
-    }}
-    """
+    # Other fields the user volunteered in the same message are assessed
+    # concurrently with the requested one
+    extra_fields = {
+        field: value
+        for field, value in _extract_labelled_fields(user_response).items()
+        if field != (current_field or "").lower() and field not in collected
+    }
     
     try:
-        completion = groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": assessment_prompt}],
-            temperature=0.2,
-            max_tokens=500
+        results = await asyncio.gather(
+            _assess_single(current_field, user_response, collected),
+            *(_assess_single(field, value, collected) for field, value in extra_fields.items()),
+            return_exceptions=True
         )
+        if isinstance(results[0], Exception):
+            raise results[0]
+        assessment, tool_result = results[0]
         
-        assessment = json.loads(completion.choices[0].message.content.strip())
+        # Store volunteered fields that passed assessment; failures are simply
+        # asked for again later
+        recorded_extras = []
+        for field, result in zip(extra_fields, results[1:]):
+            if isinstance(result, Exception) or not _is_confident(result[0]):
+                continue
+            collected[field] = result[0]["extracted_value"]
+            if result[1] is not None:
+                _record_field_validation(state, field, result[1])
+            recorded_extras.append(field)
         
-        if assessment["valid"] and assessment["confidence"] > 0.7:
+        if _is_confident(assessment):
             # Store the extracted value
             state["collected_data"][current_field] = assessment["extracted_value"]
+            if tool_result is not None:
+                _record_field_validation(state, current_field, tool_result)
             state["attempts"] = 0
             
             # Thank the user and move to next field
-            thank_msg = f"Great! I've recorded your {current_field}."
-            state["messages"].append({"role": "assistant", "content": thank_msg})
+            thank_msg = f"Great! I've recorded your {', '.join([current_field] + recorded_extras)}."
+            _append_assistant_message(state, thank_msg)
             
             # Determine next action
             state["next_action"] = "analyze_fields"
@@ -283,23 +498,19 @@ def assess_user_response(state: OnboardingState) -> OnboardingState:
             
             if state["attempts"] > 2:
                 # Too many attempts, mark for manual review
-                state["messages"].append({
-                    "role": "assistant", 
-                    "content": f"I'm having trouble understanding your {current_field}. Let's move on for now and our team will help you with this later."
-                })
+                _append_assistant_message(
+                    state,
+                    f"I'm having trouble understanding your {current_field}. Let's move on for now and our team will help you with this later."
+                )
                 state["collected_data"][f"{current_field}_pending"] = user_response
+                if tool_result is not None:
+                    _record_field_validation(state, current_field, tool_result)
                 state["next_action"] = "analyze_fields"
             else:
                 # Provide feedback and retry
-                state["messages"].append({
-                    "role": "assistant",
-                    "content": assessment["feedback"]
-                })
+                _append_assistant_message(state, assessment["feedback"])
                 if assessment.get("clarification_prompt"):
-                    state["messages"].append({
-                        "role": "assistant",
-                        "content": assessment["clarification_prompt"]
-                    })
+                    _append_assistant_message(state, assessment["clarification_prompt"])
                 state["next_action"] = "wait_response"
         
     except Exception as e:
@@ -310,64 +521,48 @@ def assess_user_response(state: OnboardingState) -> OnboardingState:
     
     return state
 
-def validate_all_data(state: OnboardingState) -> OnboardingState:
+async def validate_all_data(state: OnboardingState) -> OnboardingState:
     """Validate all collected data and calculate risk score"""
     
     data = state["collected_data"]
     field_validations = state.get("field_validation_results", {})
     
-    # Count validation failures
-    validation_failures = sum(1 for v in field_validations.values() if not v.get("valid", True))
-    fields_needing_review = sum(1 for v in field_validations.values() if v.get("needs_manual_review", False))
+    # Count validation failures (kept up to date as each field is validated)
+    if "validation_failure_count" in state:
+        validation_failures = state["validation_failure_count"]
+        fields_needing_review = state.get("manual_review_count", 0)
+    else:
+        validation_failures = 0
+        fields_needing_review = 0
+        for v in field_validations.values():
+            if not v.get("valid", True):
+                validation_failures += 1
+            if v.get("needs_manual_review", False):
+                fields_needing_review += 1
     
     # Use AI to perform comprehensive validation
     validation_prompt = f"""
-    As a compliance expert, validate the following producer data for completeness and authenticity:
-    
-    Data: {json.dumps(data, indent=2)}
-    
-    Field Validation Results: {json.dumps(field_validations, indent=2)}
-    
-    Consider:
-    1. Number of validation failures: {validation_failures}
-    2. Fields needing manual review: {fields_needing_review}
-    3. Check completeness - are all critical fields present?
-    4. Check consistency - does the data make sense together?
-    5. Identify any red flags or suspicious patterns
-    6. Calculate a risk score (0-100) based on:
-       - Completeness (30%)
-       - Data validity (30%) - weight validation failures heavily
-       - Business credibility (20%)
-       - Compliance with regulations (20%)
-    
-    Add 10 points to risk score for each validation failure.
-    Add 5 points for each field needing manual review.
-    
-    Consider Indian business regulations and typical patterns.
-    
-    Respond in JSON format:
-    {{
-        "completeness_percentage": 0-100,
-        "is_complete": true/false,
-        "issues": [
-            {{"field": "field_name", "issue": "description", "severity": 0.0-1.0}}
-        ],
-        "risk_score": 0-100,
-        "risk_factors": ["list of risk factors"],
-        "recommendations": ["list of recommendations"],
-        "requires_manual_verification": true/false
-    }}
+    Data: {prompt_json(data)}
+    
+    Field Validation Results: {prompt_json(field_validations)}
+    
+    Number of validation failures: {validation_failures}
+    Fields needing manual review: {fields_needing_review}
     """
     
     try:
-        completion = groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": validation_prompt}],
+        validation = await chat_completion_json(
+            model=_MODEL_BY_TASK["reason"],
+            messages=[
+                {"role": "system", "content": _VALIDATION_PREAMBLE},
+                {"role": "user", "content": validation_prompt}
+            ],
             temperature=0.3,
-            max_tokens=1000
+            max_tokens=1000,
+            cache=True,
+            schema=DataValidationStruct
         )
         
-        validation = json.loads(completion.choices[0].message.content.strip())
         state["validation_results"] = validation
         state["risk_score"] = validation["risk_score"]
         
@@ -392,7 +587,7 @@ def validate_all_data(state: OnboardingState) -> OnboardingState:
     
     return state
 
-def schedule_verification(state: OnboardingState) -> OnboardingState:
+async def schedule_verification(state: OnboardingState) -> OnboardingState:
     """Schedule manual verification using Calendly if needed"""
     
     risk_score = state["risk_score"]
@@ -427,7 +622,7 @@ def schedule_verification(state: OnboardingState) -> OnboardingState:
     else:
         # Try to schedule via Calendly
         try:
-            scheduling_result = calendly.create_meeting_for_verification(
+            scheduling_result = await calendly.create_meeting_for_verification(
                 producer_data=producer_data,
                 risk_score=risk_score,
                 priority=priority
@@ -484,7 +679,7 @@ def schedule_verification(state: OnboardingState) -> OnboardingState:
             Is there anything else you'd like to add to help expedite the verification process?
             """
     
-    state["messages"].append({"role": "assistant", "content": verification_msg})
+    _append_assistant_message(state, verification_msg)
     state["status"] = "pending_verification"
     state["next_action"] = "end"
     
@@ -506,7 +701,7 @@ def complete_onboarding(state: OnboardingState) -> OnboardingState:
     Thank you for choosing our platform! If you have any questions, please don't hesitate to ask.
     """
     
-    state["messages"].append({"role": "assistant", "content": completion_msg})
+    _append_assistant_message(state, completion_msg)
     state["status"] = "completed"
     state["next_action"] = "end"
     
@@ -523,18 +718,34 @@ def should_continue(state: OnboardingState) -> str:
     return next_action
 
 # Create the workflow
+# Routing functions for the conditional edges
+def _route_from_analyze(state: OnboardingState) -> str:
+    """Prompt for the next field, or validate once nothing is missing"""
+    return "prompt" if state["current_field"] else "validate"
+
+def _route_from_validate(state: OnboardingState) -> str:
+    """Follow the next action chosen by validation"""
+    return state["next_action"]
+
+# Node name -> node function
+_NODES = (
+    ("analyze_fields", analyze_required_fields),
+    ("prompt", generate_contextual_prompt),
+    ("assess", assess_user_response),
+    ("validate", validate_all_data),
+    ("schedule_verification", schedule_verification),
+    ("complete", complete_onboarding)
+)
+
+@lru_cache(maxsize=1)
 def create_onboarding_workflow():
-    """Create and compile the onboarding workflow"""
+    """Create and compile the onboarding workflow (built once per process)"""
     
     workflow = StateGraph(OnboardingState)
     
     # Add nodes
-    workflow.add_node("analyze_fields", analyze_required_fields)
-    workflow.add_node("prompt", generate_contextual_prompt)
-    workflow.add_node("assess", assess_user_response)
-    workflow.add_node("validate", validate_all_data)
-    workflow.add_node("schedule_verification", schedule_verification)
-    workflow.add_node("complete", complete_onboarding)
+    for name, node in _NODES:
+        workflow.add_node(name, node)
     
     # Add edges
     workflow.add_edge(START, "analyze_fields")
@@ -542,7 +753,7 @@ def create_onboarding_workflow():
     # Add conditional edges based on next_action
     workflow.add_conditional_edges(
         "analyze_fields",
-        lambda x: "prompt" if x["current_field"] else "validate",
+        _route_from_analyze,
         {
             "prompt": "prompt",
             "validate": "validate"
@@ -554,7 +765,7 @@ def create_onboarding_workflow():
     
     workflow.add_conditional_edges(
         "validate",
-        lambda x: x["next_action"],
+        _route_from_validate,
         {
             "complete": "complete",
             "schedule_verification": "schedule_verification",
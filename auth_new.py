@@ -2,22 +2,79 @@
 Authentication and security utilities
 """
 
+import time
+import uuid
 import jwt
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, NamedTuple, Optional
+from cachetools import TTLCache
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+from database import get_async_db
 from config import JWT_SECRET_KEY
 
 security = HTTPBearer()
 
+# JWT settings resolved once at import instead of on every encode/decode
+_JWT_KEY_BYTES = JWT_SECRET_KEY.encode("utf-8")
+_JWT_ALGORITHM = "HS256"
+_JWT_ALGS = (_JWT_ALGORITHM,)
+_JWT_DECODE_OPTS = {"require": ["exp", "sub"], "verify_aud": False, "verify_iss": False}
+_ACCESS_TOKEN_TTL_SECONDS = 24 * 60 * 60
+
+# argon2id parameters tuned for roughly 50ms per hash; accounts created before
+# the switch keep their bcrypt hashes until their next successful login
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+class CachedUser(NamedTuple):
+    user: Any
+    exp: float
+
+# Recently verified tokens, so repeat calls skip the JWT check and user lookup.
+# Entries live at most 60s and never past the token's own expiry. Only the
+# async get_current_user touches it, on the event loop, so it needs no lock.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+class LazyUser:
+    """
+    Authenticated user built from signed token claims. id, username and email
+    come straight from the token; any other attribute needs the full User row,
+    fetched with await load(db) first.
+    """
+    
+    def __init__(self, id: str, username: str, email: Optional[str]):
+        self.id = uuid.UUID(id)
+        self.username = username
+        self.email = email
+        self._user = None
+    
+    async def load(self, db: AsyncSession):
+        """Fetch the full User row, or None if the user no longer exists"""
+        if self._user is None:
+            from database import User
+            self._user = await db.get(User, self.id)
+        return self._user
+    
+    def __getattr__(self, name):
+        # Only reached for attributes not set in __init__. A blocking query
+        # here would stall the event loop, so the row must already be loaded
+        if name.startswith("_") or self._user is None:
+            raise AttributeError(name)
+        return getattr(self._user, name)
+
 # Pydantic models for auth
 class UserRegister(BaseModel):
-    username: str
-    email: str
+    # Bounds match the users table columns
+    username: str = Field(max_length=64)
+    email: str = Field(max_length=254)
     password: str
 
 class UserLogin(BaseModel):
@@ -29,32 +86,44 @@ class Token(BaseModel):
     token_type: str
 
 class UserResponse(BaseModel):
-    id: str
+    id: uuid.UUID
     username: str
     email: str
-    is_active: str
+    is_active: bool
     created_at: datetime
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+    """Hash a password using argon2id"""
+    return password_hasher.hash(password)
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+    """Verify a password against its hash (argon2id or legacy bcrypt)"""
+    if hashed_password.startswith("$2"):
+        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+    try:
+        return password_hasher.verify(hashed_password, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check if a stored hash is bcrypt or uses outdated argon2 parameters"""
+    return hashed_password.startswith("$2") or password_hasher.check_needs_rehash(hashed_password)
+
+def user_token_claims(user) -> dict:
+    """Claims identifying a user inside an access token"""
+    return {"sub": str(user.id), "username": user.username, "email": user.email}
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
     to_encode = data.copy()
+    # exp is stored as epoch seconds, so skip datetime arithmetic entirely
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(time.time()) + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(hours=24)
+        expire = int(time.time()) + _ACCESS_TOKEN_TTL_SECONDS
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm="HS256")
+    to_encode["exp"] = expire
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY_BYTES, algorithm=_JWT_ALGORITHM)
     return encoded_jwt
 
 def authenticate_user(db: Session, username: str, password: str):
@@ -65,16 +134,39 @@ def authenticate_user(db: Session, username: str, password: str):
         return False
     if not verify_password(password, user.hashed_password):
         return False
+    if password_needs_rehash(user.hashed_password):
+        # Upgrade the stored hash now that we have the plaintext
+        user.hashed_password = hash_password(password)
+        db.commit()
+    return user
+
+async def authenticate_user_async(db: AsyncSession, username: str, password: str):
+    """Authenticate a user on the async engine; hashing runs off the event loop"""
+    from database import User
+    result = await db.execute(select(User).where(User.username == username))
+    user = result.scalars().first()
+    if not user:
+        return False
+    if not await run_in_threadpool(verify_password, password, user.hashed_password):
+        return False
+    if password_needs_rehash(user.hashed_password):
+        # Upgrade the stored hash now that we have the plaintext
+        user.hashed_password = await run_in_threadpool(hash_password, password)
+        await db.commit()
     return user
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_async_db)):
     """Get current user from JWT token"""
-    from database import User, get_db
+    from database import User
     token = credentials.credentials
+    cached = _token_cache.get(token)
+    if cached is not None and cached.exp > time.time():
+        return cached.user
+    
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=["HS256"])
-        username: str = payload.get("sub")
-        if username is None:
+        payload = jwt.decode(token, _JWT_KEY_BYTES, algorithms=_JWT_ALGS, options=_JWT_DECODE_OPTS)
+        subject: str = payload.get("sub")
+        if subject is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
@@ -87,7 +179,13 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.username == username).first()
+    if "username" in payload:
+        # The token carries the user's identity, so no lookup is needed
+        user = LazyUser(id=subject, username=payload["username"], email=payload.get("email"))
+    else:
+        # Older tokens only carry the username as their subject
+        result = await db.execute(select(User).where(User.username == subject))
+        user = result.scalars().first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -95,15 +193,17 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    _token_cache[token] = CachedUser(user=user, exp=payload["exp"])
+    
     return user
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_async_db)):
     """Verify JWT authentication token and return user"""
-    return get_current_user(credentials, db)
+    return await get_current_user(credentials, db)
 
 # Optional: Make some endpoints public (no auth required)
-def optional_verify_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)):
+async def optional_verify_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(security), db: AsyncSession = Depends(get_async_db)):
     """Optional token verification - returns None if no token provided"""
     if not credentials:
         return None
-    return verify_token(credentials)
+    return await verify_token(credentials, db)
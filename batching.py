@@ -0,0 +1,72 @@
+"""
+Micro-batching for requests that can share one upstream call
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+
+class MicroBatcher:
+    """
+    Coalesce calls that arrive within window_ms of each other (up to
+    max_size) into one call to handler, which takes the list of items and
+    returns one result per item in the same order. An exception in a result
+    slot is raised to that item's caller only; a failed batch fails every
+    caller in it.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_size: int,
+        window_ms: float
+    ):
+        self._handler = handler
+        self.max_size = max_size
+        self.window = window_ms / 1000
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item for the next batch and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        # Hold a reference so the task isn't collected mid-flight
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        try:
+            results = await self._handler([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            # Callers that disconnected have already cancelled their future
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+        for _, future in batch[len(results):]:
+            if not future.done():
+                future.set_exception(RuntimeError("Batch handler returned too few results"))
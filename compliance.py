@@ -0,0 +1,585 @@
+"""
+Compliance validators for Indian business identifiers (GST, PAN, FSSAI,
+phone, email, PIN code) and the Calendly scheduler, shared by
+validation_tools and tools
+"""
+import asyncio
+import bisect
+import itertools
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlencode
+
+import httpx
+import orjson
+from cachetools import TTLCache
+
+# GST layout as a pattern, matching per line of a newline-joined batch; it
+# accepts exactly what _is_gst does
+_GST_LINE_PATTERN = re.compile(r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}[Z]{1}[0-9A-Z]{1}$', re.MULTILINE)
+_MOBILE_PATTERN = re.compile(r'^[6-9][0-9]{9}$')
+_LANDLINE_PATTERN = re.compile(r'^[0-9]{2,4}[0-9]{6,8}$')
+_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+# Longest address SMTP allows (RFC 5321); also bounds the email regex's backtracking
+_EMAIL_MAX_LENGTH = 254
+
+# Phone separators removed with one str.translate pass: every whitespace
+# character (all of them sit below U+3001), dashes, parentheses and plus signs
+_PHONE_STRIP = str.maketrans("", "", "".join(c for c in map(chr, range(0x3001)) if c.isspace()) + "-()+")
+
+# Fixed-layout numbers are checked with length tests and C string scans rather
+# than the regex engine; isascii() keeps non-Latin letters and digits out
+
+def _is_digits(s: str, length: int) -> bool:
+    """Exactly length ASCII digits"""
+    return len(s) == length and s.isascii() and s.isdigit()
+
+def _is_pan(s: str) -> bool:
+    """PAN layout: 5 capital letters, 4 digits, 1 capital letter"""
+    return (
+        len(s) == 10 and s.isascii() and s.isupper()
+        and s[:5].isalpha() and s[5:9].isdigit() and s[9].isalpha()
+    )
+
+def _is_gst(s: str) -> bool:
+    """GST layout: 2 digits, a PAN, 1 capital letter or non-zero digit, 'Z', 1 capital letter or digit"""
+    return (
+        len(s) == 15 and s[:2].isdigit() and _is_pan(s[2:12])
+        and s[12].isalnum() and s[12] != "0" and s[13] == "Z" and s[14].isalnum()
+        and s.isascii() and s.isupper()
+    )
+
+# Failure results, shared by every call instead of rebuilt each time; callers
+# must treat validator results as read-only
+_GST_REQUIRED = {"valid": False, "error": "GST number is required"}
+_GST_INVALID_FORMAT = {
+    "valid": False, 
+    "error": "Invalid GST format. GST should be 15 characters (e.g., 27AAPFU0939F1ZV)"
+}
+_PAN_REQUIRED = {"valid": False, "error": "PAN number is required"}
+_PAN_INVALID_FORMAT = {
+    "valid": False,
+    "error": "Invalid PAN format. PAN should be 10 characters (e.g., ABCDE1234F)"
+}
+_FSSAI_REQUIRED = {"valid": False, "error": "FSSAI license number is required"}
+_FSSAI_INVALID_FORMAT = {
+    "valid": False,
+    "error": "FSSAI license should be exactly 14 digits"
+}
+_PHONE_REQUIRED = {"valid": False, "error": "Phone number is required"}
+_PHONE_INVALID = {
+    "valid": False,
+    "error": "Invalid phone number. Please provide a valid Indian mobile number (10 digits) or landline with STD code"
+}
+_EMAIL_REQUIRED = {"valid": False, "error": "Email address is required"}
+_PINCODE_REQUIRED = {"valid": False, "error": "PIN code is required"}
+_PINCODE_INVALID_FORMAT = {
+    "valid": False,
+    "error": "Invalid PIN code. Indian PIN codes are 6 digits (e.g., 400001)"
+}
+
+# Lookup tables for decoding validated numbers, built once at import
+
+# GST state codes
+_GST_STATE_CODES = {
+    "01": "Jammu and Kashmir", "02": "Himachal Pradesh", "03": "Punjab",
+    "04": "Chandigarh", "05": "Uttarakhand", "06": "Haryana",
+    "07": "Delhi", "08": "Rajasthan", "09": "Uttar Pradesh",
+    "10": "Bihar", "11": "Sikkim", "12": "Arunachal Pradesh",
+    "13": "Nagaland", "14": "Manipur", "15": "Mizoram",
+    "16": "Tripura", "17": "Meghalaya", "18": "Assam",
+    "19": "West Bengal", "20": "Jharkhand", "21": "Odisha",
+    "22": "Chhattisgarh", "23": "Madhya Pradesh", "24": "Gujarat",
+    "25": "Daman and Diu", "26": "Dadra and Nagar Haveli", "27": "Maharashtra",
+    "28": "Karnataka", "29": "Goa", "30": "Lakshadweep",
+    "31": "Kerala", "32": "Tamil Nadu", "33": "Puducherry",
+    "34": "Andaman and Nicobar Islands", "35": "Andhra Pradesh", "36": "Telangana",
+    "37": "Andhra Pradesh", "38": "Ladakh"
+}
+
+# PAN holder type (4th character)
+_PAN_HOLDER_TYPES = {
+    'P': 'Individual',
+    'C': 'Company', 
+    'H': 'HUF',
+    'F': 'Firm',
+    'A': 'Association of Persons',
+    'T': 'Trust',
+    'B': 'Body of Individuals',
+    'L': 'Local Authority',
+    'J': 'Artificial Juridical Person',
+    'G': 'Government'
+}
+
+# FSSAI license type (first digit)
+_FSSAI_LICENSE_TYPES = {
+    '1': 'Central License',
+    '2': 'State License', 
+    '3': 'Registration'
+}
+
+# Common email domain typos and the domain they were meant to be
+_DOMAIN_TYPOS = {
+    'gmai.com': 'gmail.com', 'gmial.com': 'gmail.com', 'gamil.com': 'gmail.com', 'gmail.co': 'gmail.com',
+    'yahoo.co': 'yahoo.com', 'yaho.com': 'yahoo.com', 'yahoo.in': 'yahoo.com',
+    'outlok.com': 'outlook.com', 'outlook.co': 'outlook.com',
+    'hotmai.com': 'hotmail.com', 'hotmail.co': 'hotmail.com'
+}
+
+# Metro STD codes (after any leading 0) are 2 digits long; the rest are 3
+_METRO_STD_CODES = frozenset({'11', '22', '33', '44', '79', '80'})
+
+# Disposable email domains (basic list)
+_DISPOSABLE_DOMAINS = frozenset({'tempmail.com', '10minutemail.com', 'guerrillamail.com'})
+
+# PIN code postal region (first digit)
+_PIN_REGIONS = {
+    '1': 'Northern',
+    '2': 'Northern', 
+    '3': 'Western',
+    '4': 'Western',
+    '5': 'Southern',
+    '6': 'Southern',
+    '7': 'Eastern',
+    '8': 'Eastern',
+    '9': 'Army Postal Service'
+}
+
+
+
+def validate_gst(gst_number: str) -> Dict[str, Any]:
+    """Validate GST number format and structure"""
+    if not gst_number:
+        return _GST_REQUIRED
+    
+    # Remove spaces and convert to uppercase
+    gst_clean = gst_number.replace(" ", "").upper()
+    
+    # GST format: 2 digit state code + 10 char PAN + 1 digit + 1 check alphabet + 1 digit
+    if not _is_gst(gst_clean):
+        return _GST_INVALID_FORMAT
+    
+    return _gst_details(gst_clean)
+
+
+def _gst_details(gst_clean: str) -> Dict[str, Any]:
+    """Result for a cleaned GST number already known to match the format"""
+    # Extract state code
+    state_code = gst_clean[:2]
+    state_name = _GST_STATE_CODES.get(state_code, "Unknown")
+    
+    return {
+        "valid": True,
+        "error": None,
+        "details": {
+            "state_code": state_code,
+            "state": state_name,
+            "formatted_gst": gst_clean
+        }
+    }
+
+
+def validate_pan(pan_number: str) -> Dict[str, Any]:
+    """Validate PAN number format"""
+    if not pan_number:
+        return _PAN_REQUIRED
+    
+    # Remove spaces and convert to uppercase
+    pan_clean = pan_number.replace(" ", "").upper()
+    
+    # PAN format: 5 letters + 4 digits + 1 letter
+    if not _is_pan(pan_clean):
+        return _PAN_INVALID_FORMAT
+    
+    # Determine holder type from 4th character
+    holder_type = _PAN_HOLDER_TYPES.get(pan_clean[3], 'Unknown')
+    
+    return {
+        "valid": True,
+        "error": None,
+        "details": {
+            "holder_type": holder_type,
+            "formatted_pan": pan_clean
+        }
+    }
+
+
+def validate_fssai(fssai_number: str) -> Dict[str, Any]:
+    """Validate FSSAI license number"""
+    if not fssai_number:
+        return _FSSAI_REQUIRED
+    
+    # Remove spaces
+    fssai_clean = fssai_number.replace(" ", "")
+    
+    # FSSAI is 14 digits
+    if not _is_digits(fssai_clean, 14):
+        return _FSSAI_INVALID_FORMAT
+    
+    # First digit indicates license type
+    license_type = _FSSAI_LICENSE_TYPES.get(fssai_clean[0], 'Unknown')
+    
+    return {
+        "valid": True,
+        "error": None,
+        "details": {
+            "business_type": license_type,
+            "formatted_fssai": fssai_clean
+        }
+    }
+
+
+def validate_phone(phone_number: str) -> Dict[str, Any]:
+    """Validate Indian phone number"""
+    if not phone_number:
+        return _PHONE_REQUIRED
+    
+    # Remove spaces, dashes, and parentheses
+    phone_clean = phone_number.translate(_PHONE_STRIP)
+    
+    # Remove country code if present
+    if phone_clean.startswith('91') and len(phone_clean) == 12:
+        phone_clean = phone_clean[2:]
+    elif phone_clean.startswith('+91') and len(phone_clean) == 13:
+        phone_clean = phone_clean[3:]
+    
+    # Mobile number (10 digits starting with 6-9)
+    if len(phone_clean) == 10 and _MOBILE_PATTERN.match(phone_clean):
+        return {
+            "valid": True,
+            "error": None,
+            "details": {
+                "type": "mobile",
+                "formatted_phone": phone_clean
+            }
+        }
+    # Landline with STD code (10-11 digits)
+    elif len(phone_clean) >= 10 and _LANDLINE_PATTERN.match(phone_clean):
+        trunk = 1 if phone_clean[0] == '0' else 0
+        std_length = trunk + (2 if phone_clean[trunk:trunk + 2] in _METRO_STD_CODES else 3)
+        return {
+            "valid": True,
+            "error": None,
+            "details": {
+                "type": "landline",
+                "formatted_phone": phone_clean,
+                "std_code": phone_clean[:std_length],
+                "number": phone_clean[std_length:]
+            }
+        }
+    else:
+        return _PHONE_INVALID
+
+
+def validate_email(email: str) -> Dict[str, Any]:
+    """Validate email address with suggestions"""
+    if not email:
+        return _EMAIL_REQUIRED
+    
+    email_clean = email.strip()
+    at = email_clean.rfind("@")
+    # Basic email regex, behind cheap checks that most malformed input fails:
+    # a local part, a dot in the domain and a sane length
+    if (
+        at < 1 or "." not in email_clean[at + 1:] or len(email_clean) > _EMAIL_MAX_LENGTH
+        or not _EMAIL_PATTERN.match(email_clean)
+    ):
+        # Try to suggest a correction when the domain is a common typo
+        email_lower = email_clean.lower()
+        local, _, domain = email_lower.rpartition("@")
+        correct_domain = _DOMAIN_TYPOS.get(domain)
+        
+        return {
+            "valid": False,
+            "error": "Invalid email format",
+            "details": {
+                "suggestion": f"{local}@{correct_domain}" if correct_domain else None
+            }
+        }
+    
+    email_lower = email_clean.lower()
+    return {
+        "valid": True,
+        "error": None,
+        "details": {
+            "formatted_email": email_lower,
+            "is_disposable": email_lower[at + 1:] in _DISPOSABLE_DOMAINS
+        }
+    }
+
+
+def validate_pincode(pincode: str) -> Dict[str, Any]:
+    """Validate Indian PIN code"""
+    if not pincode:
+        return _PINCODE_REQUIRED
+    
+    # Remove spaces
+    pin_clean = pincode.replace(" ", "")
+    
+    # Indian PIN codes are 6 digits
+    if not _is_digits(pin_clean, 6):
+        return _PINCODE_INVALID_FORMAT
+    
+    # First digit indicates postal region
+    region = _PIN_REGIONS.get(pin_clean[0], 'Unknown')
+    
+    return {
+        "valid": True,
+        "error": None,
+        "details": {
+            "region": region,
+            "formatted_pincode": pin_clean
+        }
+    }
+
+
+def _validate_gst_batch(values: Sequence[str]) -> List[Dict[str, Any]]:
+    """validate_gst for many numbers, format-checked in one regex pass"""
+    cleaned = [value.replace(" ", "").upper() if value else "" for value in values]
+    joined = "\n".join(cleaned)
+    # Offset in joined where each row starts, to map matches back to rows
+    starts = list(itertools.accumulate((len(gst) + 1 for gst in cleaned), initial=0))
+    
+    formatted = set()
+    for match in _GST_LINE_PATTERN.finditer(joined):
+        row = bisect.bisect_right(starts, match.start()) - 1
+        # A value with an embedded newline could match on part of its row only
+        if match.start() == starts[row] and match.end() - match.start() == len(cleaned[row]):
+            formatted.add(row)
+    
+    results = []
+    for row, (value, gst_clean) in enumerate(zip(values, cleaned)):
+        if not value:
+            results.append(_GST_REQUIRED)
+        elif row in formatted:
+            results.append(_gst_details(gst_clean))
+        else:
+            results.append(_GST_INVALID_FORMAT)
+    return results
+
+
+_VALIDATORS_BY_KIND = {
+    "gst": validate_gst,
+    "pan": validate_pan,
+    "fssai": validate_fssai,
+    "phone": validate_phone,
+    "email": validate_email,
+    "pincode": validate_pincode
+}
+
+
+def validate_batch(kind: str, values: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Validate many values of one kind (gst, pan, fssai, phone, email or
+    pincode), e.g. a column of a bulk import. Results are in input order and
+    identical to calling the single-value validator on each.
+    """
+    if kind == "gst":
+        return _validate_gst_batch(values)
+    try:
+        validate = _VALIDATORS_BY_KIND[kind]
+    except KeyError:
+        raise ValueError(f"Unknown validation kind: {kind}") from None
+    return [validate(value) for value in values]
+
+
+class ComplianceValidator:
+    """Namespace over the module-level validators, kept for existing callers"""
+    validate_gst = staticmethod(validate_gst)
+    validate_pan = staticmethod(validate_pan)
+    validate_fssai = staticmethod(validate_fssai)
+    validate_phone = staticmethod(validate_phone)
+    validate_email = staticmethod(validate_email)
+    validate_pincode = staticmethod(validate_pincode)
+    validate_batch = staticmethod(validate_batch)
+
+
+# Availability is reused for this long by lookups whose window falls in the same hours
+_SLOT_CACHE_TTL_SECONDS = 60
+
+def _hour(moment: datetime) -> str:
+    """The start of moment's hour, as an ISO string"""
+    return moment.replace(minute=0, second=0, microsecond=0).isoformat()
+
+
+class CalendlyScheduler:
+    """Calendly integration for scheduling verification meetings"""
+    
+    def __init__(self, api_token: str, event_type_uuid: str):
+        self.api_token = api_token
+        self.event_type_uuid = event_type_uuid
+        self.base_url = "https://api.calendly.com"
+        self.headers = {
+            "Authorization": f"Bearer {api_token}",
+            "Content-Type": "application/json"
+        }
+        # Shared keep-alive pool so repeat calls skip the TCP/TLS handshake;
+        # connection attempts that fail are retried up to 3 times
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60),
+                retries=3
+            ),
+            timeout=10.0
+        )
+        self._slot_cache: TTLCache = TTLCache(maxsize=256, ttl=_SLOT_CACHE_TTL_SECONDS)
+        # Held across the lookup, so a burst of onboardings for the same
+        # window waits for one Calendly call instead of each making its own
+        self._slot_cache_lock = asyncio.Lock()
+    
+    async def aclose(self):
+        """Close the pooled HTTP connections"""
+        await self._client.aclose()
+    
+    async def get_available_slots(self, date_from: datetime, date_to: datetime) -> Dict[str, Any]:
+        """Get available time slots from Calendly"""
+        
+        # Windows are bucketed to the hour, so bursts of onboardings share one lookup
+        key = (self.event_type_uuid, _hour(date_from), _hour(date_to))
+        async with self._slot_cache_lock:
+            cached = self._slot_cache.get(key)
+            if cached is not None:
+                return cached
+            
+            try:
+                response = await self._client.get("/event_type_available_times", params={
+                    "event_type": f"{self.base_url}/event_types/{self.event_type_uuid}",
+                    "start_time": date_from.isoformat(),
+                    "end_time": date_to.isoformat()
+                })
+                response.raise_for_status()
+                slots = orjson.loads(response.content)
+            except (httpx.HTTPError, ValueError) as e:
+                return {"error": str(e), "available_times": []}
+            
+            # Only successful lookups are cached; errors are retried next call
+            self._slot_cache[key] = slots
+            return slots
+    
+    async def _create_scheduling_link(self) -> Dict[str, Any]:
+        """Create a single-use Calendly scheduling link for the verification event type"""
+        # Bodies go through orjson; the client already sends Content-Type: application/json
+        response = await self._client.post("/scheduling_links", content=orjson.dumps({
+            "max_event_count": 1,
+            "owner": f"{self.base_url}/event_types/{self.event_type_uuid}",
+            "owner_type": "EventType"
+        }))
+        response.raise_for_status()
+        return orjson.loads(response.content).get("resource", {})
+    
+    async def create_scheduled_event(self,
+                                     invitee_email: str,
+                                     invitee_name: str,
+                                     scheduled_time: datetime,
+                                     questions: Optional[list] = None,
+                                     custom_data: Optional[dict] = None) -> Dict[str, Any]:
+        """Create a scheduled event through Calendly API"""
+        
+        # Calendly API v2 doesn't create scheduled events directly; the invitee
+        # books through a one-time scheduling link instead
+        try:
+            scheduling_link = await self._create_scheduling_link()
+        except (httpx.HTTPError, ValueError) as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        booking_url = scheduling_link.get("booking_url")
+        
+        # Add query parameters for pre-filling, escaped so names and
+        # answers containing &, = or spaces survive intact
+        if booking_url:
+            params = {"name": invitee_name, "email": invitee_email}
+            # Calendly typically supports up to 3 custom questions
+            params.update((f"a{i + 1}", q) for i, q in enumerate((questions or [])[:3]))
+            booking_url += "?" + urlencode(params)
+        
+        return {
+            "success": True,
+            "booking_url": booking_url,
+            "scheduling_link": scheduling_link
+        }
+    
+    async def create_meeting_for_verification(self, producer_data: Dict[str, Any], risk_score: float, priority: str) -> Dict[str, Any]:
+        """Create a verification meeting based on risk assessment"""
+        
+        # Determine urgency and meeting duration
+        if risk_score >= 70:
+            urgency_note = "High Risk - Urgent verification required"
+            meeting_duration = 45  # minutes
+        elif risk_score >= 50:
+            urgency_note = "Medium Risk - Priority verification needed"
+            meeting_duration = 30
+        else:
+            urgency_note = "Standard verification process"
+            meeting_duration = 20
+        
+        # Generate meeting details
+        meeting_details = {
+            "event_type_uuid": self.event_type_uuid,
+            "producer_data": producer_data,
+            "risk_score": risk_score,
+            "priority": priority,
+            "meeting_duration": meeting_duration,
+            "notes": f"Producer verification meeting. {urgency_note}",
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+        
+        # Schedule based on priority
+        now = datetime.now(timezone.utc)
+        if priority == "urgent":
+            date_from = now
+            date_to = now + timedelta(hours=4)
+        elif priority == "high":
+            date_from = now
+            date_to = now + timedelta(days=1)
+        else:
+            date_from = now + timedelta(days=1)
+            date_to = now + timedelta(days=3)
+        
+        # Use a real scheduling link and availability when Calendly credentials
+        # are configured, otherwise fall back to the team's static booking page
+        booking_url = None
+        available_slots = []
+        if self.api_token and self.event_type_uuid:
+            # The slot lookup and link creation are independent, so their
+            # round trips overlap on the shared client
+            slots, result = await asyncio.gather(
+                self.get_available_slots(date_from, date_to),
+                self.create_scheduled_event(
+                    invitee_email=producer_data.get('email', ''),
+                    invitee_name=producer_data.get('name', 'Producer'),
+                    scheduled_time=date_from,  # This would be an actual slot in production
+                    questions=[
+                        f"Business Type: {producer_data.get('business_type', 'Not provided')}",
+                        f"Risk Score: {risk_score:.1f}/100 - {urgency_note}",
+                        f"GST: {producer_data.get('gst_number', 'Not provided')}"
+                    ],
+                    custom_data=meeting_details
+                )
+            )
+            available_slots = slots.get("collection", [])[:5]  # First 5 slots
+            if result["success"]:
+                booking_url = result["booking_url"]
+            else:
+                print(f"Error creating Calendly scheduling link: {result['error']}")
+        if not booking_url:
+            booking_url = f"https://calendly.com/verification-team/producer-verification-{priority}"
+        
+        return {
+            "scheduling_result": {
+                "success": True,
+                "booking_url": booking_url,
+                "meeting_id": uuid.uuid4().hex,
+                "duration_minutes": meeting_duration
+            },
+            "available_slots": available_slots,
+            "urgency_note": urgency_note,
+            "priority": priority,
+            "risk_score": risk_score
+        }
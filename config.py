@@ -4,14 +4,74 @@ Configuration settings and environment variables
 import os
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables once per process tree; workers spawned by the
+# server inherit the already-populated environment
+if not os.getenv("_DOTENV_LOADED"):
+    load_dotenv()
+    os.environ["_DOTENV_LOADED"] = "1"
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./transparency_assessment.db")
+# URL for the asyncio engine used by request handlers; derived from
+# DATABASE_URL (asyncpg / aiosqlite) when not set explicitly
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+# Create missing tables on app startup; turn off where the schema is managed
+# by migrations (migrations/ or `python database.py` as a one-shot step)
+RUN_CREATE_ALL = os.getenv("RUN_CREATE_ALL", "true").lower() in ("1", "true")
+# Fingerprint of the last schema create_all ran against; unchanged means skip
+SCHEMA_CACHE_PATH = os.getenv("SCHEMA_CACHE_PATH", ".schema_cache")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+# Compiled-statement cache entries per engine (SQLAlchemy's default is 500)
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Connections each worker opens at startup so early requests skip the
+# connect/TLS/auth handshake; 0 disables the warmup
+DB_POOL_WARMUP = min(int(os.getenv("DB_POOL_WARMUP", str(DB_POOL_SIZE))), DB_POOL_SIZE)
+# Statements slower than this are logged; 0 disables the slow-query log
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "50"))
+# Set DB_POOLER_MODE=transaction when behind PgBouncer (or a similar pooler) in
+# transaction mode: pre-ping is then off by default, since its SELECT 1 leaves
+# server connections idle in transaction, and connections are recycled before
+# the pooler's server_idle_timeout instead
+DB_POOLER_MODE = os.getenv("DB_POOLER_MODE", "session")
+_TRANSACTION_POOLER = DB_POOLER_MODE == "transaction"
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "60" if _TRANSACTION_POOLER else "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false" if _TRANSACTION_POOLER else "true").lower() == "true"
 
 # Groq configuration
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", "8"))
+GROQ_TIMEOUT_SECONDS = float(os.getenv("GROQ_TIMEOUT_SECONDS", "30"))
+# Retries on 429/408/409/5xx and connection errors, with exponential backoff
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "3"))
+# Requests per minute sent to Groq from this process, retries included
+GROQ_REQUESTS_PER_MINUTE = float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+
+# LLM response cache configuration
+LLM_CACHE_MAXSIZE = int(os.getenv("LLM_CACHE_MAXSIZE", "4096"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+
+# /validate-data requests arriving within the window are validated together
+# in one completion (up to the batch size); a window of 0 turns batching off
+VALIDATION_BATCH_WINDOW_MS = float(os.getenv("VALIDATION_BATCH_WINDOW_MS", "50"))
+VALIDATION_BATCH_MAX_SIZE = int(os.getenv("VALIDATION_BATCH_MAX_SIZE", "8"))
+
+# Repeated /validate-data requests (same Idempotency-Key and body) within this
+# many seconds get the stored response instead of a new validation
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "300"))
+
+# Largest accepted audio upload for transcription
+MAX_AUDIO_UPLOAD_BYTES = int(os.getenv("MAX_AUDIO_UPLOAD_MB", "25")) * 1024 * 1024
+
+# How long GET /api/onboarding/stream waits for a streamed start to finish
+START_STREAM_TIMEOUT_SECONDS = float(os.getenv("START_STREAM_TIMEOUT_SECONDS", "60"))
+
+# Onboarding session storage: Redis when REDIS_URL is set (required for more
+# than one worker), otherwise in-process; sessions expire after the TTL
+REDIS_URL = os.getenv("REDIS_URL")
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "3600"))
+SESSION_CACHE_MAXSIZE = int(os.getenv("SESSION_CACHE_MAXSIZE", "10000"))
 
 # Calendly configuration
 CALENDLY_API_TOKEN = os.getenv("CALENDLY_API_TOKEN")
@@ -21,8 +81,15 @@ CALENDLY_EVENT_TYPE_UUID = os.getenv("CALENDLY_EVENT_TYPE_UUID")
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-jwt-secret-key-here")
 
+# Browser origins allowed to call the API with credentials (comma-separated)
+CORS_ALLOW_ORIGINS = tuple(
+    origin.strip()
+    for origin in os.getenv("CORS_ALLOW_ORIGINS", "http://localhost:3000").split(",")
+    if origin.strip()
+)
+
 # Indian Consumer Safety Guidelines Questions
-TRANSPARENCY_QUESTIONS = [
+TRANSPARENCY_QUESTIONS = (
     "Please provide detailed information about all ingredients/components used in your product. Are there any potentially harmful substances that consumers should be aware of?",
     
     "What quality control measures and testing procedures do you implement during manufacturing? Please share your quality certifications and compliance standards.",
@@ -34,4 +101,4 @@ TRANSPARENCY_QUESTIONS = [
     "What is your product's shelf life, storage requirements, and proper usage instructions? How do you ensure consumers receive accurate information?",
     
     "Do you have a system for tracking adverse events, consumer complaints, and product recalls? How transparent are you about product issues and their resolution?"
-]
\ No newline at end of file
+)
\ No newline at end of file
@@ -2,78 +2,273 @@
 Database configuration and models
 """
 
+import asyncio
+import hashlib
+from contextlib import contextmanager
+import os
+import re
+import time
 import uuid
-from datetime import datetime
-from sqlalchemy import create_engine, Column, String, DateTime, Integer, Text, Float
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import create_engine, event, make_url, Column, String, DateTime, Integer, Text, Float, Boolean, JSON, Uuid, Index, text, true
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 # Patch for CockroachDB version detection
 import sqlalchemy.dialects.postgresql.base as postgresql_base
 
-original_get_server_version_info = postgresql_base.PGDialect._get_server_version_info
+# The stock parser's pattern, applied to the banner already fetched below
+# instead of letting the stock parser query it again
+_PG_VERSION_PATTERN = re.compile(
+    r".*(?:PostgreSQL|EnterpriseDB) (\d+)\.?(\d+)?(?:\.(\d+))?(?:\.\d+)?(?:devel|beta)?"
+)
 
 def patched_get_server_version_info(self, connection):
-    """Patched version to handle CockroachDB version strings"""
-    try:
-        return original_get_server_version_info(self, connection)
-    except AssertionError as e:
-        if "CockroachDB" in str(e):
-            # Return a fake PostgreSQL version for CockroachDB
-            return (13, 0, 0)  # PostgreSQL 13 compatible
-        raise
+    """Patched version to handle CockroachDB version strings (probed once per dialect)"""
+    cached = getattr(self, "_cached_server_version_info", None)
+    if cached is not None:
+        return cached
+    
+    banner = connection.exec_driver_sql("select pg_catalog.version()").scalar()
+    if "CockroachDB" in banner:
+        # Report a fake PostgreSQL version for CockroachDB
+        version = (13, 0, 0)  # PostgreSQL 13 compatible
+    else:
+        match = _PG_VERSION_PATTERN.match(banner)
+        if not match:
+            raise AssertionError(f"Could not determine version from string '{banner}'")
+        version = tuple(int(part) for part in match.group(1, 2, 3) if part is not None)
+    
+    self._cached_server_version_info = version
+    return version
 
 postgresql_base.PGDialect._get_server_version_info = patched_get_server_version_info
 
 # Database setup
-from config import DATABASE_URL
+from config import (
+    DATABASE_URL, ASYNC_DATABASE_URL, DB_POOLER_MODE, DB_POOL_SIZE, DB_QUERY_CACHE_SIZE, DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING, DB_POOL_WARMUP,
+    DB_SLOW_QUERY_MS, SCHEMA_CACHE_PATH
+)
+
+# Keep a warm pool of server connections so requests don't pay the
+# TCP/TLS/auth handshake; SQLite uses its own default pooling. The compiled
+# cache is sized so each statement is compiled once per process.
+engine_options = {"echo": False, "query_cache_size": DB_QUERY_CACHE_SIZE}
+if not DATABASE_URL.startswith("sqlite"):
+    engine_options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING
+    )
 
-engine = create_engine(DATABASE_URL, echo=False)
+engine = create_engine(DATABASE_URL, **engine_options)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Thread-local sessions for code outside the request cycle; open and remove
+# them on the same thread
+ScopedSession = scoped_session(SessionLocal)
+
+# libpq-only connection parameters asyncpg does not accept as keywords
+# (it reads PGSSLROOTCERT and friends from the environment instead)
+_LIBPQ_ONLY_PARAMS = ("sslrootcert", "sslcert", "sslkey", "sslcrl", "options")
+
+def _async_database_url(url: str) -> str:
+    """Point the configured URL at the asyncio driver for its backend"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if backend != "postgresql":
+        return url
+    
+    query = {k: v for k, v in parsed.query.items() if k not in _LIBPQ_ONLY_PARAMS}
+    sslmode = query.pop("sslmode", None)
+    if sslmode:
+        query["ssl"] = sslmode
+    return parsed.set(drivername="postgresql+asyncpg", query=query).render_as_string(hide_password=False)
+
+# Async engine for request handlers, so DB waits free the event loop instead
+# of holding a threadpool thread. asyncpg speaks the Postgres wire protocol,
+# so it works against CockroachDB as well (the version patch above applies).
+async_engine_options = dict(engine_options)
+if DB_POOLER_MODE == "transaction" and not DATABASE_URL.startswith("sqlite"):
+    # Prepared statements don't survive transaction-mode pooling
+    async_engine_options["connect_args"] = {"statement_cache_size": 0}
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL or _async_database_url(DATABASE_URL), **async_engine_options
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+def _reset_pools_after_fork():
+    """Drop connections inherited from the parent (e.g. gunicorn --preload)"""
+    # close=False leaves the parent's sockets alone; the child opens its own
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+# Slow-query log: only a timer read per statement, output only past the threshold
+_SLOW_QUERY_NS = int(DB_SLOW_QUERY_MS * 1_000_000)
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start_ns"] = time.perf_counter_ns()
+
+def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter_ns() - conn.info["query_start_ns"]
+    if elapsed > _SLOW_QUERY_NS:
+        token = context.execution_options.get("logging_token") if context is not None else None
+        prefix = f"[{token}] " if token else ""
+        print(f"{prefix}Slow query ({elapsed / 1_000_000:.1f} ms): {' '.join(statement.split())[:500]}")
+
+if _SLOW_QUERY_NS > 0:
+    for _engine in (engine, async_engine.sync_engine):
+        event.listen(_engine, "before_cursor_execute", _start_query_timer)
+        event.listen(_engine, "after_cursor_execute", _log_slow_query)
+
 Base = declarative_base()
 
+# JSON columns are JSONB on PostgreSQL/CockroachDB and plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 # Database Models
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(String, primary_key=True, index=True)
-    username = Column(String, unique=True, index=True, nullable=False)
-    email = Column(String, unique=True, index=True, nullable=False)
-    hashed_password = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    is_active = Column(String, default="true")  # Using string for CockroachDB compatibility
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    username = Column(String(64), unique=True, index=True, nullable=False)
+    email = Column(String(254), unique=True, index=True, nullable=False)
+    hashed_password = Column(String(128), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    is_active = Column(Boolean, default=True, nullable=False, server_default=true())
 
 class Product(Base):
     __tablename__ = "products"
     
-    id = Column(String, primary_key=True, index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     company_name = Column(String, nullable=False)
     product_name = Column(String, nullable=False)
-    product_id = Column(String, nullable=False, unique=True)
+    product_id = Column(String(64), nullable=False, unique=True)
     description = Column(Text, nullable=False)
-    domain = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    domain = Column(String(128), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
 class AssessmentSession(Base):
     __tablename__ = "assessment_sessions"
+    __table_args__ = (
+        Index("ix_sessions_product_status", "product_id", "status"),
+        Index("ix_sessions_updated_at", "updated_at"),
+    )
     
-    session_id = Column(String, primary_key=True, index=True)
-    product_id = Column(String, nullable=False)
-    current_question = Column(Integer, default=1)
-    questions_data = Column(Text)  # JSON string
-    responses = Column(Text)  # JSON string
-    scores = Column(Text)  # JSON string
-    final_score = Column(Float, default=0.0)
-    status = Column(String, default="active")  # active, completed
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow)
-
-# Create tables
-Base.metadata.create_all(bind=engine)
-
-# Dependency for database session
+    session_id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    product_id = Column(String(64), nullable=False)
+    current_question = Column(Integer, default=1, nullable=False, server_default=text("1"))
+    questions_data = Column(JSONType)
+    responses = Column(JSONType)
+    scores = Column(JSONType)
+    final_score = Column(Float, default=0.0, nullable=False, server_default=text("0"))
+    status = Column(String(16), default="active", nullable=False, server_default="active")  # active, completed
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+def schema_fingerprint() -> str:
+    """Hash the target database and every table's columns, types and indexes"""
+    tables = sorted(
+        (
+            table.name,
+            tuple((column.name, str(column.type)) for column in table.columns),
+            tuple(sorted(index.name for index in table.indexes))
+        )
+        for table in Base.metadata.tables.values()
+    )
+    return hashlib.sha1(repr((DATABASE_URL, tables)).encode("utf-8")).hexdigest()
+
+# Create tables (run at app startup or from the command line, never at import)
+def init_db():
+    """
+    Create any missing tables. Skipped entirely when the schema fingerprint
+    matches the one recorded after the last successful run, which saves the
+    information_schema round-trips on every worker boot. SQLite is always
+    checked directly, since its file can be deleted under a stale cache.
+    """
+    use_cache = not DATABASE_URL.startswith("sqlite")
+    fingerprint = schema_fingerprint()
+    if use_cache:
+        try:
+            with open(SCHEMA_CACHE_PATH) as f:
+                if f.read().strip() == fingerprint:
+                    return
+        except OSError:
+            pass
+    
+    Base.metadata.create_all(bind=engine)
+    if not use_cache:
+        return
+    
+    try:
+        with open(SCHEMA_CACHE_PATH, "w") as f:
+            f.write(fingerprint)
+    except OSError as e:
+        print(f"Could not write schema cache: {e}")
+
+# Dependency for database session. FastAPI may enter and exit a sync
+# dependency on different threadpool threads, so each request gets its own
+# explicit session rather than a thread-local one.
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+@contextmanager
+def db_session():
+    """
+    Transactional session for scripts and background work, outside the
+    request cycle. Commits on success and rolls back on error. Nested blocks
+    on the same thread share the outer block's scoped session, which alone
+    commits and releases it.
+    """
+    if ScopedSession.registry.has():
+        yield ScopedSession()
+        return
+    
+    db = ScopedSession()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        ScopedSession.remove()
+
+async def warm_pool():
+    """Fill the async pool up front instead of on the first requests after boot"""
+    if DATABASE_URL.startswith("sqlite") or DB_POOL_WARMUP <= 0:
+        return
+    
+    async def _open():
+        return await async_engine.connect()
+    
+    results = await asyncio.gather(*(_open() for _ in range(DB_POOL_WARMUP)), return_exceptions=True)
+    failures = [r for r in results if isinstance(r, BaseException)]
+    # Returning the connections parks them in the pool, ready for reuse
+    for conn in results:
+        if not isinstance(conn, BaseException):
+            await conn.close()
+    if failures:
+        print(f"Pool warmup opened {len(results) - len(failures)}/{len(results)} connections: {failures[0]}")
+
+async def get_async_db():
+    """Per-request session on the async engine"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+if __name__ == "__main__":
+    init_db()
+    print("Database tables created successfully!")
\ No newline at end of file
@@ -0,0 +1,249 @@
+"""
+Shared async Groq client for LLM calls
+"""
+import asyncio
+import hashlib
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+import msgspec
+import orjson
+from aiolimiter import AsyncLimiter
+from cachetools import TTLCache
+from groq import AsyncGroq, BadRequestError
+
+from config import (
+    GROQ_API_KEY, GROQ_MAX_CONCURRENCY, GROQ_MAX_RETRIES,
+    GROQ_REQUESTS_PER_MINUTE, GROQ_TIMEOUT_SECONDS,
+    LLM_CACHE_MAXSIZE, LLM_CACHE_TTL_SECONDS
+)
+from session_store import redis_client
+
+# Token bucket spacing requests out to the configured rate, so bursts queue
+# here instead of tripping Groq's limit and retrying
+_groq_limiter = AsyncLimiter(GROQ_REQUESTS_PER_MINUTE, 60)
+
+
+class _RateLimitedTransport(httpx.AsyncHTTPTransport):
+    """Takes a limiter token for every request on the wire, retries included"""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async with _groq_limiter:
+            return await super().handle_async_request(request)
+
+
+# One pooled HTTP client for the app's lifetime, speaking HTTP/2 so concurrent
+# completions multiplex over one TLS connection. Every completion holds the
+# semaphore below, so the pool is sized to it and all connections stay warm.
+_groq_http_client = httpx.AsyncClient(
+    transport=_RateLimitedTransport(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=GROQ_MAX_CONCURRENCY,
+            max_keepalive_connections=GROQ_MAX_CONCURRENCY
+        )
+    ),
+    timeout=httpx.Timeout(GROQ_TIMEOUT_SECONDS, connect=5.0),
+    follow_redirects=True
+)
+
+# Initialize async Groq client (shared by every onboarding session). The SDK
+# retries rate limits (429), timeouts and 5xx itself: exponential backoff from
+# 0.5s up to 8s with jitter, or the server's Retry-After when it sends one.
+groq_client = AsyncGroq(
+    api_key=GROQ_API_KEY,
+    http_client=_groq_http_client,
+    max_retries=GROQ_MAX_RETRIES
+)
+
+# Bound the number of in-flight completions across all sessions so concurrent
+# sessions overlap their round-trips without tripping Groq's rate limits
+_groq_semaphore = asyncio.Semaphore(GROQ_MAX_CONCURRENCY)
+
+# Exact-match cache of JSON completions, keyed by a hash of the full request.
+# The in-process layer is checked first; with Redis configured, entries are
+# also shared across workers under llm:<hash>.
+_response_cache: TTLCache = TTLCache(maxsize=LLM_CACHE_MAXSIZE, ttl=LLM_CACHE_TTL_SECONDS)
+_REDIS_KEY_PREFIX = "llm:"
+
+# Groq JSON mode: the server only returns a syntactically valid JSON object
+_JSON_OBJECT_FORMAT = {"type": "json_object"}
+
+
+async def close_groq_client() -> None:
+    """Close the Groq connection pool"""
+    await groq_client.close()
+
+
+def prompt_json(obj: Any) -> str:
+    """Render data as indented JSON with sorted keys for embedding in prompts"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
+
+
+def _cache_key(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    json_mode: bool
+) -> str:
+    """Hash everything that determines a completion into a cache key"""
+    payload = orjson.dumps(
+        [model, messages, temperature, max_tokens, json_mode], option=orjson.OPT_SORT_KEYS
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+async def _cache_get(key: str) -> Optional[str]:
+    """Look a response up locally, then in Redis; Redis errors count as a miss"""
+    cached = _response_cache.get(key)
+    if cached is not None or redis_client is None:
+        return cached
+    try:
+        data = await redis_client.get(_REDIS_KEY_PREFIX + key)
+    except Exception as e:
+        print(f"LLM cache read failed: {e}")
+        return None
+    if data is None:
+        return None
+    cached = data.decode("utf-8")
+    _response_cache[key] = cached
+    return cached
+
+
+async def _cache_set(key: str, content: str) -> None:
+    """Store a response locally and, when configured, in Redis"""
+    _response_cache[key] = content
+    if redis_client is None:
+        return
+    try:
+        await redis_client.set(_REDIS_KEY_PREFIX + key, content, ex=LLM_CACHE_TTL_SECONDS)
+    except Exception as e:
+        print(f"LLM cache write failed: {e}")
+
+
+async def chat_completion_stream(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int
+) -> AsyncIterator[str]:
+    """Stream a chat completion, yielding content deltas as they arrive"""
+    async with _groq_semaphore:
+        stream = await groq_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        try:
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        finally:
+            # Release the connection even if the consumer stopped early
+            await stream.close()
+
+
+async def chat_completion(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    cache: bool = False
+) -> str:
+    """
+    Run a chat completion and return the stripped message content.
+    With cache=True, identical requests are answered from the response cache.
+    """
+    key = _cache_key(model, messages, temperature, max_tokens, False) if cache else None
+    if key is not None:
+        cached = await _cache_get(key)
+        if cached is not None:
+            return cached
+
+    parts = []
+    async for delta in chat_completion_stream(model, messages, temperature, max_tokens):
+        parts.append(delta)
+    content = "".join(parts).strip()
+
+    if key is not None and content:
+        await _cache_set(key, content)
+
+    return content
+
+
+def _is_json_generation_failure(error: BadRequestError) -> bool:
+    """Groq's 400 for a JSON-mode completion that did not produce valid JSON"""
+    body = error.body.get("error") if isinstance(error.body, dict) else None
+    return isinstance(body, dict) and body.get("code") == "json_validate_failed"
+
+
+async def _create_json_completion(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int
+) -> str:
+    """Request one JSON-mode completion and return its raw content"""
+    completion = await groq_client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        response_format=_JSON_OBJECT_FORMAT
+    )
+    return completion.choices[0].message.content
+
+
+def _decode_json(content: str, schema: Optional[type]) -> Dict[str, Any]:
+    """Parse JSON content, validating it against a msgspec schema when given"""
+    if schema is None:
+        return orjson.loads(content)
+    return msgspec.to_builtins(msgspec.json.decode(content, type=schema))
+
+
+async def chat_completion_json(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    cache: bool = False,
+    schema: Optional[type] = None
+) -> Dict[str, Any]:
+    """
+    Run a chat completion in Groq's JSON mode and parse the content.
+    The server guarantees a single JSON object, so prompts only need to name
+    the expected keys (and must mention JSON); a generation Groq rejects as
+    invalid JSON is retried once at temperature 0.
+    With schema set to a msgspec.Struct, the JSON is decoded and validated
+    against it in one pass (missing defaults filled in) and returned as a dict;
+    a malformed response raises msgspec.ValidationError.
+    With cache=True, identical requests are answered from the response cache;
+    only responses that parse successfully are cached.
+    """
+    key = _cache_key(model, messages, temperature, max_tokens, True) if cache else None
+    if key is not None:
+        cached = await _cache_get(key)
+        if cached is not None:
+            return _decode_json(cached, schema)
+
+    # JSON mode does not stream; the whole object arrives in one response
+    async with _groq_semaphore:
+        try:
+            content = await _create_json_completion(model, messages, temperature, max_tokens)
+        except BadRequestError as e:
+            # Groq rejects sampled output that isn't valid JSON; one greedy
+            # retry almost always succeeds
+            if temperature == 0 or not _is_json_generation_failure(e):
+                raise
+            content = await _create_json_completion(model, messages, 0, max_tokens)
+
+    parsed = _decode_json(content, schema)
+
+    if key is not None:
+        await _cache_set(key, content)
+
+    return parsed
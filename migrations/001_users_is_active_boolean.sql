@@ -0,0 +1,7 @@
+-- Convert users.is_active from 'true'/'false' strings to a native BOOLEAN
+-- PostgreSQL / CockroachDB; apply once before deploying the Boolean column
+ALTER TABLE users ALTER COLUMN is_active DROP DEFAULT;
+ALTER TABLE users ALTER COLUMN is_active TYPE BOOL USING (is_active = 'true');
+UPDATE users SET is_active = TRUE WHERE is_active IS NULL;
+ALTER TABLE users ALTER COLUMN is_active SET DEFAULT TRUE;
+ALTER TABLE users ALTER COLUMN is_active SET NOT NULL;
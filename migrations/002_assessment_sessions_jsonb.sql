@@ -0,0 +1,5 @@
+-- Store assessment session JSON payloads as native JSONB instead of TEXT
+-- PostgreSQL / CockroachDB; apply once before deploying the JSONB columns
+ALTER TABLE assessment_sessions ALTER COLUMN questions_data TYPE JSONB USING questions_data::jsonb;
+ALTER TABLE assessment_sessions ALTER COLUMN responses TYPE JSONB USING responses::jsonb;
+ALTER TABLE assessment_sessions ALTER COLUMN scores TYPE JSONB USING scores::jsonb;
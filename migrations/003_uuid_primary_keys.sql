@@ -0,0 +1,18 @@
+-- Store generated primary keys as native UUID instead of 36-character strings
+-- Apply once before deploying the Uuid columns
+
+-- PostgreSQL
+ALTER TABLE users ALTER COLUMN id TYPE UUID USING id::uuid;
+ALTER TABLE products ALTER COLUMN id TYPE UUID USING id::uuid;
+ALTER TABLE assessment_sessions ALTER COLUMN session_id TYPE UUID USING session_id::uuid;
+
+-- CockroachDB cannot change the type of an indexed column in place; swap
+-- the primary key onto a backfilled UUID column instead (repeat per table):
+--
+-- ALTER TABLE users ADD COLUMN id_uuid UUID;
+-- UPDATE users SET id_uuid = id::uuid;
+-- ALTER TABLE users ALTER COLUMN id_uuid SET NOT NULL;
+-- ALTER TABLE users ALTER PRIMARY KEY USING COLUMNS (id_uuid);
+-- DROP INDEX users@users_id_key CASCADE;
+-- ALTER TABLE users DROP COLUMN id;
+-- ALTER TABLE users RENAME COLUMN id_uuid TO id;
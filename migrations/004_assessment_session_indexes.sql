@@ -0,0 +1,9 @@
+-- Secondary indexes for assessment session lookups, and removal of indexes
+-- that only duplicated primary keys
+-- PostgreSQL syntax; on CockroachDB write DROP INDEX as table@index_name
+CREATE INDEX IF NOT EXISTS ix_sessions_product_status ON assessment_sessions (product_id, status);
+CREATE INDEX IF NOT EXISTS ix_sessions_updated_at ON assessment_sessions (updated_at);
+
+DROP INDEX IF EXISTS ix_users_id;
+DROP INDEX IF EXISTS ix_products_id;
+DROP INDEX IF EXISTS ix_assessment_sessions_session_id;
@@ -0,0 +1,12 @@
+-- Fill created_at/updated_at in the database instead of the application
+-- PostgreSQL / CockroachDB; existing naive values are read as UTC
+ALTER TABLE users ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE 'UTC';
+ALTER TABLE users ALTER COLUMN created_at SET DEFAULT now();
+
+ALTER TABLE products ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE 'UTC';
+ALTER TABLE products ALTER COLUMN created_at SET DEFAULT now();
+
+ALTER TABLE assessment_sessions ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE 'UTC';
+ALTER TABLE assessment_sessions ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE assessment_sessions ALTER COLUMN updated_at TYPE TIMESTAMPTZ USING updated_at AT TIME ZONE 'UTC';
+ALTER TABLE assessment_sessions ALTER COLUMN updated_at SET DEFAULT now();
@@ -0,0 +1,22 @@
+-- Backfill NULLs, then make always-set columns NOT NULL with server defaults
+-- PostgreSQL / CockroachDB; apply after 005_server_side_timestamps.sql
+UPDATE users SET created_at = now() WHERE created_at IS NULL;
+ALTER TABLE users ALTER COLUMN created_at SET NOT NULL;
+
+UPDATE products SET created_at = now() WHERE created_at IS NULL;
+ALTER TABLE products ALTER COLUMN created_at SET NOT NULL;
+
+UPDATE assessment_sessions SET created_at = now() WHERE created_at IS NULL;
+UPDATE assessment_sessions SET updated_at = created_at WHERE updated_at IS NULL;
+UPDATE assessment_sessions SET current_question = 1 WHERE current_question IS NULL;
+UPDATE assessment_sessions SET final_score = 0 WHERE final_score IS NULL;
+UPDATE assessment_sessions SET status = 'active' WHERE status IS NULL;
+
+ALTER TABLE assessment_sessions ALTER COLUMN created_at SET NOT NULL;
+ALTER TABLE assessment_sessions ALTER COLUMN updated_at SET NOT NULL;
+ALTER TABLE assessment_sessions ALTER COLUMN current_question SET DEFAULT 1;
+ALTER TABLE assessment_sessions ALTER COLUMN current_question SET NOT NULL;
+ALTER TABLE assessment_sessions ALTER COLUMN final_score SET DEFAULT 0;
+ALTER TABLE assessment_sessions ALTER COLUMN final_score SET NOT NULL;
+ALTER TABLE assessment_sessions ALTER COLUMN status SET DEFAULT 'active';
+ALTER TABLE assessment_sessions ALTER COLUMN status SET NOT NULL;
@@ -0,0 +1,20 @@
+-- Spread the monotonically increasing updated_at index across ranges
+-- CockroachDB only (22.1+); PostgreSQL keeps the plain B-tree from 004
+--
+-- Sequential timestamps all land in the last range of a plain index, so every
+-- session write hits one node. A hash-sharded index splits the keys into
+-- buckets; "recent sessions" scans still read a bounded span per bucket.
+-- The primary key is a random UUID and is already evenly distributed.
+DROP INDEX IF EXISTS assessment_sessions@ix_sessions_updated_at;
+CREATE INDEX ix_sessions_updated_at ON assessment_sessions (updated_at) USING HASH WITH (bucket_count = 16);
+
+-- Range partitioning by created_at needs created_at as the primary key
+-- prefix. If archived sessions ever dominate, swap the key and partition
+-- by quarter:
+--
+-- ALTER TABLE assessment_sessions ALTER PRIMARY KEY USING COLUMNS (created_at, session_id);
+-- ALTER TABLE assessment_sessions PARTITION BY RANGE (created_at) (
+--     PARTITION p_2025_q1 VALUES FROM ('2025-01-01') TO ('2025-04-01'),
+--     PARTITION p_2025_q2 VALUES FROM ('2025-04-01') TO ('2025-07-01'),
+--     PARTITION p_default VALUES FROM (MINVALUE) TO (MAXVALUE)
+-- );
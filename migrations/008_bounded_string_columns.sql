@@ -0,0 +1,15 @@
+-- Bound string columns to realistic lengths
+-- PostgreSQL / CockroachDB; check for longer values first, e.g.
+-- SELECT count(*) FROM users WHERE length(username) > 64;
+-- CockroachDB rewrites the column to narrow its type and refuses that for
+-- indexed columns (username, email, products.product_id); swap those via a
+-- backfilled column as in 003_uuid_primary_keys.sql
+ALTER TABLE users ALTER COLUMN username TYPE VARCHAR(64);
+ALTER TABLE users ALTER COLUMN email TYPE VARCHAR(254);
+ALTER TABLE users ALTER COLUMN hashed_password TYPE VARCHAR(128);
+
+ALTER TABLE products ALTER COLUMN product_id TYPE VARCHAR(64);
+ALTER TABLE products ALTER COLUMN domain TYPE VARCHAR(128);
+
+ALTER TABLE assessment_sessions ALTER COLUMN product_id TYPE VARCHAR(64);
+ALTER TABLE assessment_sessions ALTER COLUMN status TYPE VARCHAR(16);
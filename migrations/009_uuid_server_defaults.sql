@@ -0,0 +1,9 @@
+-- Let the database generate primary keys for rows inserted outside the app
+-- PostgreSQL 13+ / CockroachDB; the app still sends its own uuid4 values
+ALTER TABLE users ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE products ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE assessment_sessions ALTER COLUMN session_id SET DEFAULT gen_random_uuid();
+
+-- No USING HASH on these primary keys: random UUIDs already spread inserts
+-- across ranges, so hash sharding would only add a bucket column and fan out
+-- point lookups.
@@ -3,8 +3,18 @@ Producer onboarding models and data structures
 """
 from enum import Enum
 from typing import Dict, Any, List, Optional
-from pydantic import BaseModel
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime, timezone
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# Request bodies drop unknown keys; responses are built once and never
+# modified, so they are frozen
+_REQUEST_CONFIG = ConfigDict(extra="ignore")
+_RESPONSE_CONFIG = ConfigDict(frozen=True)
 
 
 class OnboardingStatus(str, Enum):
@@ -27,6 +37,8 @@ class ValidationSeverity(str, Enum):
 
 class ValidationIssue(BaseModel):
     """Model for validation issues"""
+    model_config = _RESPONSE_CONFIG
+
     field: str
     issue_type: str  # Updated to match API documentation
     description: str  # Updated to match API documentation
@@ -36,6 +48,8 @@ class ValidationIssue(BaseModel):
 
 class AnswerAssessmentResponse(BaseModel):
     """Response model for answer assessment"""
+    model_config = _RESPONSE_CONFIG
+
     valid: bool
     confidence: float
     extracted_value: Optional[str]
@@ -46,6 +60,8 @@ class AnswerAssessmentResponse(BaseModel):
 
 class DataValidationResponse(BaseModel):
     """Response model for data validation"""
+    model_config = _RESPONSE_CONFIG
+
     completeness_percentage: float
     is_complete: bool
     data_quality_issues: List[ValidationIssue]  # Updated field name
@@ -74,8 +90,8 @@ class ProducerData(BaseModel):
     established_year: Optional[int] = None
     
     # Metadata
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
+    created_at: datetime = Field(default_factory=_utc_now)
+    updated_at: datetime = Field(default_factory=_utc_now)
     session_id: Optional[str] = None
     producer_id: Optional[str] = None
 
@@ -94,14 +110,16 @@ class OnboardingSession(BaseModel):
     conversation_context: Dict[str, Any] = {}
     
     # Timestamps
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
+    created_at: datetime = Field(default_factory=_utc_now)
+    updated_at: datetime = Field(default_factory=_utc_now)
     completed_at: Optional[datetime] = None
 
 
 # Request/Response models for API endpoints
 class DataValidationRequest(BaseModel):
     """Request model for data validation"""
+    model_config = _REQUEST_CONFIG
+
     producer_data: Dict[str, Any]
     business_type: Optional[str] = None
     validation_level: str = "standard"  # standard, strict, comprehensive
@@ -109,6 +127,8 @@ class DataValidationRequest(BaseModel):
 
 class PromptGenerationRequest(BaseModel):
     """Request model for prompt generation"""
+    model_config = _REQUEST_CONFIG
+
     focus_field: Optional[str] = None  # Updated field name to match API docs
     partial_data: Dict[str, Any]  # Updated field name
     context: Dict[str, Any] = {}  # Updated field name
@@ -118,6 +138,8 @@ class PromptGenerationRequest(BaseModel):
 
 class PromptGenerationResponse(BaseModel):
     """Response model for prompt generation"""
+    model_config = _RESPONSE_CONFIG
+
     prompt: str
     field_name: str  # New field to match API docs
     expected_format: str  # Updated field name
@@ -128,6 +150,8 @@ class PromptGenerationResponse(BaseModel):
 
 class AnswerAssessmentRequest(BaseModel):
     """Request model for answer assessment"""
+    model_config = _REQUEST_CONFIG
+
     question: str  # New field to match API docs
     user_answer: str  # Updated field name
     expected_field: str  # Updated field name
@@ -137,6 +161,8 @@ class AnswerAssessmentRequest(BaseModel):
 
 class VerificationScheduleRequest(BaseModel):
     """Request model for verification scheduling"""
+    model_config = _REQUEST_CONFIG
+
     producer_id: str  # New field
     producer_data: Dict[str, Any]
     risk_score: float
@@ -148,6 +174,8 @@ class VerificationScheduleRequest(BaseModel):
 
 class VerificationScheduleResponse(BaseModel):
     """Response model for verification scheduling"""
+    model_config = _RESPONSE_CONFIG
+
     verification_id: str  # New field
     producer_id: str  # New field  
     scheduled_time: Optional[datetime] = None
@@ -155,3 +183,10 @@ class VerificationScheduleResponse(BaseModel):
     estimated_wait_hours: int  # New field
     status: str  # New field
     verification_type: str  # New field
+
+
+class SessionStatusBatchRequest(BaseModel):
+    """Request model for looking up several sessions' status at once"""
+    model_config = _REQUEST_CONFIG
+
+    session_ids: List[str] = Field(..., max_length=100)
@@ -0,0 +1,146 @@
+"""
+Storage for in-progress onboarding sessions
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import msgspec
+import orjson
+import redis.asyncio as aioredis
+from cachetools import TTLCache
+
+from config import REDIS_URL
+
+_KEY_PREFIX = "sess:"
+_CHANNEL_PREFIX = "sess-events:"
+
+# A Redis count is a full SCAN; health checks reuse one this many seconds old
+_COUNT_MAX_AGE_SECONDS = 5.0
+
+# Shared Redis client (None without REDIS_URL); also used by the LLM cache
+redis_client = aioredis.from_url(REDIS_URL) if REDIS_URL else None
+
+
+class _PubSubEvents:
+    """Queue-like view of a Redis pub/sub subscription"""
+
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    async def get(self) -> Dict[str, Any]:
+        async for message in self._pubsub.listen():
+            if message["type"] == "message":
+                return orjson.loads(message["data"])
+
+
+class SessionStore:
+    """
+    Onboarding state keyed by session_id, expiring SESSION_TTL_SECONDS after
+    the last write. Backed by Redis when REDIS_URL is set, so any worker can
+    serve any session and state survives restarts; otherwise held in this
+    process, which only works with a single worker.
+
+    States are written with msgspec and decoded straight into schema (any
+    type msgspec accepts, e.g. a TypedDict), so a payload of the wrong shape
+    raises msgspec.ValidationError instead of surfacing later as a KeyError.
+    """
+
+    def __init__(
+        self,
+        redis: Optional[aioredis.Redis],
+        ttl: int,
+        maxsize: int,
+        schema: Any = Dict[str, Any]
+    ):
+        self.ttl = ttl
+        self._redis = redis
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder(schema)
+        self._local: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._listeners: Dict[str, Set[asyncio.Queue]] = {}
+        self._counted: Optional[Tuple[float, int]] = None  # (monotonic time, count)
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the session's state, or None if it is unknown or expired"""
+        if self._redis is None:
+            return self._local.get(session_id)
+        data = await self._redis.get(_KEY_PREFIX + session_id)
+        return self._decoder.decode(data) if data is not None else None
+
+    async def get_many(self, session_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """get() for several sessions, in order, with one Redis round trip"""
+        if self._redis is None:
+            return [self._local.get(session_id) for session_id in session_ids]
+        if not session_ids:
+            return []
+        values = await self._redis.mget([_KEY_PREFIX + session_id for session_id in session_ids])
+        return [self._decoder.decode(data) if data is not None else None for data in values]
+
+    async def set(self, session_id: str, state: Dict[str, Any]) -> None:
+        """Save the session's state and restart its expiry"""
+        if self._redis is None:
+            self._local[session_id] = state
+            return
+        await self._redis.set(_KEY_PREFIX + session_id, self._encoder.encode(state), ex=self.ttl)
+
+    async def delete(self, session_id: str) -> bool:
+        """Remove the session; False if it did not exist"""
+        if self._redis is None:
+            return self._local.pop(session_id, None) is not None
+        return bool(await self._redis.delete(_KEY_PREFIX + session_id))
+
+    async def count(self) -> int:
+        """Number of live sessions (with Redis, up to a few seconds stale)"""
+        if self._redis is None:
+            self._local.expire()
+            return len(self._local)
+        now = time.monotonic()
+        if self._counted is not None and now - self._counted[0] < _COUNT_MAX_AGE_SECONDS:
+            return self._counted[1]
+        count = 0
+        async for _ in self._redis.scan_iter(match=_KEY_PREFIX + "*", count=1000):
+            count += 1
+        self._counted = (now, count)
+        return count
+
+    async def publish(self, session_id: str, event: Dict[str, Any]) -> None:
+        """Announce an event to everyone currently subscribed to the session"""
+        if self._redis is None:
+            for queue in self._listeners.get(session_id, ()):
+                queue.put_nowait(event)
+            return
+        await self._redis.publish(_CHANNEL_PREFIX + session_id, orjson.dumps(event))
+
+    @asynccontextmanager
+    async def subscribe(self, session_id: str) -> AsyncIterator[Any]:
+        """
+        Receive the session's events while the block is open; await .get()
+        on the yielded object for the next one. Events published before
+        subscribing are not replayed, so check the stored state afterwards.
+        """
+        if self._redis is None:
+            queue: asyncio.Queue = asyncio.Queue()
+            self._listeners.setdefault(session_id, set()).add(queue)
+            try:
+                yield queue
+            finally:
+                listeners = self._listeners.get(session_id)
+                listeners.discard(queue)
+                if not listeners:
+                    del self._listeners[session_id]
+            return
+
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(_CHANNEL_PREFIX + session_id)
+        try:
+            yield _PubSubEvents(pubsub)
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    async def aclose(self) -> None:
+        """Release the Redis connection pool"""
+        if self._redis is not None:
+            await self._redis.aclose()
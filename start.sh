@@ -4,4 +4,4 @@
 pip install -r requirements.txt
 
 # Run the application
-uvicorn main:app --host 0.0.0.0 --port ${PORT:-8000}
+uvicorn main:app --host 0.0.0.0 --port ${PORT:-8000} --loop uvloop --http httptools
@@ -1,6 +1,7 @@
 """
 Test script to verify the agent module works correctly
 """
+import asyncio
 import sys
 import traceback
 
@@ -39,6 +40,134 @@ def test_imports():
         print(f"Traceback: {traceback.format_exc()}")
         return False
 
+def test_non_ascii_digits_rejected():
+    """FSSAI and PIN numbers written with non-ASCII digits are invalid"""
+    from compliance import validate_fssai, validate_pincode
+    print("Testing non-ASCII digits...")
+    
+    assert validate_fssai("12345678901234")["valid"]
+    assert not validate_fssai("١٢٣٤٥٦٧٨٩٠١٢٣٤")["valid"]  # Arabic-Indic
+    assert not validate_fssai("1234567890123²")["valid"]  # Superscript two
+    print("✓ FSSAI rejects non-ASCII digits")
+    
+    assert validate_pincode("400001")["valid"]
+    assert not validate_pincode("४००००१")["valid"]  # Devanagari
+    assert not validate_pincode("４００００１")["valid"]  # Fullwidth
+    print("✓ PIN code rejects non-ASCII digits")
+
+def test_gst_batch_matches_single():
+    """Batched GST validation maps each match back to its own row"""
+    from compliance import validate_batch, validate_gst
+    print("Testing batched GST validation...")
+    
+    values = [
+        "27AAPFU0939F1ZV",
+        "",
+        "27aapfu0939f1zv",
+        "27AAPFU0939F1ZV\nJUNK",  # Valid first line, invalid row
+        "JUNK\n27AAPFU0939F1ZV",  # Valid last line, invalid row
+        "27AAPFU0939F1ZV\n27AAPFU0939F1ZV",
+        None,
+        "29 ABCDE 1234 F 2Z5"
+    ]
+    results = validate_batch("gst", values)
+    
+    assert results == [validate_gst(value) for value in values]
+    assert [result["valid"] for result in results] == [True, False, True, False, False, False, False, True]
+    assert results[7]["details"]["state_code"] == "29"
+    print("✓ Batched GST results match single validation")
+
+def test_extracted_value_must_pass_validator():
+    """An LLM-extracted value its validator rejects is not stored"""
+    import agent
+    print("Testing extracted values against validators...")
+    
+    async def confident_extraction(**kwargs):
+        return {"valid": True, "confidence": 0.9, "extracted_value": "27AAPFU0939F1Z", "feedback": ""}
+    
+    state = {
+        "messages": [
+            {"role": "assistant", "content": "What is your GST number?"},
+            {"role": "user", "content": "my gst is 27AAPFU0939F1Z"}
+        ],
+        "current_field": "gst_number",
+        "collected_data": {},
+        "attempts": 0
+    }
+    original = agent.chat_completion_json
+    agent.chat_completion_json = confident_extraction
+    try:
+        state = asyncio.run(agent.assess_user_response(state))
+    finally:
+        agent.chat_completion_json = original
+    
+    assert "gst_number" not in state["collected_data"]
+    assert state["attempts"] == 1 and state["next_action"] == "wait_response"
+    print("✓ Rejected extracted value is asked for again")
+
+def test_verification_routing():
+    """Recorded field validation results drive the verification decisions"""
+    import agent
+    print("Testing verification routing...")
+    
+    async def low_risk_validation(**kwargs):
+        return {"completeness_percentage": 100.0, "is_complete": True, "risk_score": 20.0,
+                "requires_manual_verification": False}
+    
+    def validated_state(failures):
+        return {
+            "collected_data": {"name": "Test Foods"},
+            "field_validation_results": {"gst_number": {"valid": failures == 0}},
+            "validation_failure_count": failures,
+            "manual_review_count": 0
+        }
+    
+    original = agent.chat_completion_json
+    agent.chat_completion_json = low_risk_validation
+    try:
+        clean = asyncio.run(agent.validate_all_data(validated_state(0)))
+        failed = asyncio.run(agent.validate_all_data(validated_state(1)))
+    finally:
+        agent.chat_completion_json = original
+    
+    assert clean["next_action"] == "complete"
+    assert failed["next_action"] == "schedule_verification"
+    assert failed["validation_results"]["requires_manual_verification"]
+    print("✓ Validation failures force manual verification")
+    
+    meetings = []
+    class FakeCalendly:
+        async def create_meeting_for_verification(self, producer_data, risk_score, priority):
+            meetings.append(priority)
+            return {"scheduling_result": {"success": True, "booking_url": "https://calendly.test/book"},
+                    "urgency_note": "Medium Risk"}
+    
+    def verification_state(email_valid):
+        return {
+            "risk_score": 55.0,
+            "collected_data": {"email": "owner@example.com"},
+            "field_validation_results": {"email": {"valid": email_valid}},
+            "messages": []
+        }
+    
+    original = agent.calendly
+    agent.calendly = FakeCalendly()
+    try:
+        unverified = asyncio.run(agent.schedule_verification(verification_state(False)))
+        verified = asyncio.run(agent.schedule_verification(verification_state(True)))
+    finally:
+        agent.calendly = original
+    
+    assert meetings == ["high"]
+    assert "https://calendly.test/book" in verified["last_ai_message"]
+    assert "valid contact information" in unverified["last_ai_message"]
+    assert verified["status"] == unverified["status"] == "pending_verification"
+    print("✓ Calendly is used only with a validated email or phone")
+
 if __name__ == "__main__":
     success = test_imports()
+    test_non_ascii_digits_rejected()
+    test_gst_batch_matches_single()
+    test_extracted_value_must_pass_validator()
+    test_verification_routing()
     sys.exit(0 if success else 1)
@@ -1,3 +1,5 @@
+import asyncio
+
 try:
     from main import app
     print("✓ SUCCESS: FastAPI app loaded successfully")
@@ -6,3 +8,117 @@ except Exception as e:
     print(f"❌ ERROR: {e}")
     import traceback
     traceback.print_exc()
+
+
+def test_inflight_validation_deduplicated():
+    """Concurrent /validate-data requests with the same key share one run"""
+    import main
+    from producer_onboarding_models import DataValidationRequest
+    
+    calls = []
+    async def slow_validation(key, producer_data):
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        return {"risk_score": 10.0}
+    
+    async def run():
+        request = DataValidationRequest(producer_data={"name": "Inflight Test"})
+        return await asyncio.gather(*(
+            main.validate_producer_data(request, token="t", idempotency_key="inflight-test")
+            for _ in range(5)
+        ))
+    
+    original = main._run_validation
+    main._run_validation = slow_validation
+    try:
+        responses = asyncio.run(run())
+    finally:
+        main._run_validation = original
+    
+    assert len(calls) == 1
+    assert responses == [{"risk_score": 10.0}] * 5
+    assert not main._validation_inflight
+    print("✓ In-flight duplicate validations share one run")
+
+def test_partial_batch_results_retried():
+    """Batched validation retries records whose result is missing or lacks keys"""
+    import main
+    
+    complete = {
+        "completeness_percentage": 80.0, "is_complete": False, "risk_score": 20.0,
+        "explanation": "Batched", "missing_fields": ["gst_number"]
+    }
+    async def batch_completion(**kwargs):
+        # Record 2 comes back without its required keys; record 3 not at all
+        return {"results": [complete, {"risk_score": 30.0}]}
+    async def single_validation(producer_data):
+        return {"retried": producer_data["name"]}
+    
+    originals = main.chat_completion_json, main._validate_one
+    main.chat_completion_json, main._validate_one = batch_completion, single_validation
+    try:
+        results = asyncio.run(main._validate_batch([{"name": "A"}, {"name": "B"}, {"name": "C"}]))
+    finally:
+        main.chat_completion_json, main._validate_one = originals
+    
+    assert results[0]["explanation"] == "Batched"
+    assert results[0]["issues"] == [] and results[0]["next_required_field"] is None
+    assert results[1:] == [{"retried": "B"}, {"retried": "C"}]
+    print("✓ Partial batch results are retried per record")
+
+def test_micro_batcher_slot_failures():
+    """A failed result slot is raised to its own caller only"""
+    from batching import MicroBatcher
+    
+    async def handler(items):
+        return [ValueError(item) if item == "bad" else item.upper() for item in items]
+    
+    async def run():
+        batcher = MicroBatcher(handler, max_size=10, window_ms=10)
+        return await asyncio.gather(
+            batcher.submit("a"), batcher.submit("bad"), batcher.submit("c"),
+            return_exceptions=True
+        )
+    
+    first, failed, last = asyncio.run(run())
+    assert (first, last) == ("A", "C")
+    assert isinstance(failed, ValueError)
+    print("✓ MicroBatcher fails only the affected caller")
+
+def test_session_statuses_not_found():
+    """Batch status lookup keeps request order and lists unknown sessions"""
+    import orjson
+    import main
+    from producer_onboarding_models import SessionStatusBatchRequest
+    
+    state = {
+        "producer_id": "producer-status-test", "status": "in_progress",
+        "collected_data": {"name": "Test"}, "messages": [], "current_field": "email"
+    }
+    
+    async def run():
+        await main.session_store.set("status-test-1", state)
+        await main.session_store.set("status-test-2", state)
+        try:
+            found = await main.session_store.get_many(["status-test-2", "status-test-missing", "status-test-1"])
+            response = await main.get_session_statuses(
+                SessionStatusBatchRequest(session_ids=["status-test-1", "status-test-missing", "status-test-2"]),
+                token="t"
+            )
+        finally:
+            await main.session_store.delete("status-test-1")
+            await main.session_store.delete("status-test-2")
+        return found, orjson.loads(response.body)
+    
+    found, body = asyncio.run(run())
+    assert found == [state, None, state]
+    assert [status["session_id"] for status in body["statuses"]] == ["status-test-1", "status-test-2"]
+    assert body["statuses"][0]["collected_fields"] == ["name"]
+    assert body["not_found"] == ["status-test-missing"]
+    print("✓ Batch session status reports unknown sessions in not_found")
+
+if __name__ == "__main__":
+    test_inflight_validation_deduplicated()
+    test_partial_batch_results_retried()
+    test_micro_batcher_slot_failures()
+    test_session_statuses_not_found()